@@ -1,8 +1,11 @@
+import io
 import os
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import json
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from matplotlib.figure import Figure
+from concurrent.futures import ThreadPoolExecutor
 # import pandasai as pai
 # from pandasai_openai import OpenAI
 
@@ -21,32 +24,54 @@ This application visualizes land use transition projections from the USDA Forest
 Explore how land use is expected to change across the United States from 2020 to 2070 under different climate and socioeconomic scenarios.
 """)
 
-# Load the parquet files
-@st.cache_data
+# Parquet file backing each dataset, relative to the semantic layer directory
+DATASET_FILES = {
+    "Average Gross Change Across All Scenarios (2020-2070)": "gross_change_ensemble_all.parquet",
+    "Urbanization Trends By Decade": "urbanization_trends.parquet",
+    "Transitions to Urban Land": "to_urban_transitions.parquet",
+    "Transitions from Forest Land": "from_forest_transitions.parquet",
+    "County-Level Land Use Transitions": "county_transitions.parquet"
+}
+
+def read_datasets(data_dir):
+    # Parquet decoding releases the GIL, so the files are read concurrently
+    with ThreadPoolExecutor(max_workers=len(DATASET_FILES)) as executor:
+        frames = executor.map(
+            lambda filename: pd.read_parquet(os.path.join(data_dir, filename)),
+            DATASET_FILES.values()
+        )
+        return dict(zip(DATASET_FILES.keys(), frames))
+
+def to_csv_bytes(df):
+    # Arrow's columnar C writer is much faster than DataFrame.to_csv on large tables
+    buffer = io.BytesIO()
+    try:
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buffer)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        # Mixed-type object columns cannot be converted to Arrow; fall back to pandas
+        return df.to_csv(index=False).encode('utf-8')
+    return buffer.getvalue()
+
+def figure_to_png(fig):
+    # Rasterized once at st.pyplot's resolution; st.image then just sends the bytes
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=200, bbox_inches="tight")
+    return buffer.getvalue()
+
+# Load the parquet files once per process; the frames are shared read-only across reruns
+@st.cache_resource
 def load_parquet_data():
     # Define data directory - support both local and cloud paths
     data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "semantic_layers/base_analysis")
     
     try:
         # Try to load raw data
-        raw_data = {
-            "Average Gross Change Across All Scenarios (2020-2070)": pd.read_parquet(os.path.join(data_dir, "gross_change_ensemble_all.parquet")),
-            "Urbanization Trends By Decade": pd.read_parquet(os.path.join(data_dir, "urbanization_trends.parquet")),
-            "Transitions to Urban Land": pd.read_parquet(os.path.join(data_dir, "to_urban_transitions.parquet")),
-            "Transitions from Forest Land": pd.read_parquet(os.path.join(data_dir, "from_forest_transitions.parquet")),
-            "County-Level Land Use Transitions": pd.read_parquet(os.path.join(data_dir, "county_transitions.parquet"))
-        }
+        raw_data = read_datasets(data_dir)
     except Exception as e:
         st.error(f"Error loading data from {data_dir}: {e}")
         # Fallback to direct paths for Streamlit Cloud
         try:
-            raw_data = {
-                "Average Gross Change Across All Scenarios (2020-2070)": pd.read_parquet("semantic_layers/base_analysis/gross_change_ensemble_all.parquet"),
-                "Urbanization Trends By Decade": pd.read_parquet("semantic_layers/base_analysis/urbanization_trends.parquet"),
-                "Transitions to Urban Land": pd.read_parquet("semantic_layers/base_analysis/to_urban_transitions.parquet"),
-                "Transitions from Forest Land": pd.read_parquet("semantic_layers/base_analysis/from_forest_transitions.parquet"),
-                "County-Level Land Use Transitions": pd.read_parquet("semantic_layers/base_analysis/county_transitions.parquet")
-            }
+            raw_data = read_datasets("semantic_layers/base_analysis")
         except Exception as e2:
             st.error(f"Error with fallback path: {e2}")
             raise e2
@@ -54,32 +79,135 @@ def load_parquet_data():
     # Convert hundred acres to acres for all datasets
     data = {}
     for key, df in raw_data.items():
-        df_copy = df.copy()
+        # The frames were just read from disk and are owned here, so they are
+        # converted in place rather than copied first
         
         # Convert total_area column if it exists
-        if "total_area" in df_copy.columns:
-            df_copy["total_area"] = df_copy["total_area"] * 100
+        if "total_area" in df.columns:
+            df["total_area"] = df["total_area"] * 100
             
         # Convert specific columns for urbanization trends dataset
         if key == "Urbanization Trends By Decade":
             area_columns = ["forest_to_urban", "cropland_to_urban", "pasture_to_urban"]
             for col in area_columns:
-                if col in df_copy.columns:
-                    df_copy[col] = df_copy[col] * 100
+                if col in df.columns:
+                    df[col] = df[col] * 100
+        
+        # Repeated labels (scenarios, decades, categories, states) are stored as
+        # categoricals so filters and groupbys compare integer codes, not strings
+        for col in df.select_dtypes(include=["object"]).columns:
+            if df[col].nunique() < len(df) // 2:
+                df[col] = df[col].astype("category")
+        
+        # Integer ids and years fit in narrower types without changing any value
+        for col in df.select_dtypes(include=["integer"]).columns:
+            df[col] = pd.to_numeric(df[col], downcast="integer")
         
-        data[key] = df_copy
+        data[key] = df
     
     return data
 
-# Load RPA documentation
+# County totals by transition type, cached across reruns since the source data never changes
 @st.cache_data
-def load_rpa_docs():
-    try:
-        with open("docs/rpa_text/gtr_wo102_Chap4_chunks.json", "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        st.warning("RPA documentation file not found")
-        return []
+def load_county_totals():
+    county_df = load_parquet_data()["County-Level Land Use Transitions"]
+    return county_df.groupby(
+        ["county_name", "state_name", "from_category", "to_category"], dropna=False, observed=True
+    )["total_area"].sum().reset_index()
+
+# Per-scenario slices of a dataset, split once so each selection is a dict lookup
+@st.cache_resource
+def load_scenario_slices(dataset_name):
+    df = load_parquet_data()[dataset_name]
+    return {str(name): group for name, group in df.groupby("scenario_name", sort=False, observed=True)}
+
+# Scenario charts are rendered once per scenario; reruns with the same selection reuse the PNG
+@st.cache_resource
+def build_urbanization_chart(scenario):
+    filtered_urban = load_scenario_slices("Urbanization Trends By Decade")[scenario]
+    
+    # Explicit Figure objects skip pyplot's global registry, so nothing accumulates across reruns
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    ax.plot(filtered_urban["decade_name"], filtered_urban["forest_to_urban"], marker='o', label="Forest to Urban")
+    ax.plot(filtered_urban["decade_name"], filtered_urban["cropland_to_urban"], marker='s', label="Cropland to Urban")
+    ax.plot(filtered_urban["decade_name"], filtered_urban["pasture_to_urban"], marker='^', label="Pasture to Urban")
+    ax.set_xlabel("Time Period")
+    ax.set_ylabel("Acres")
+    ax.set_title(f"Land Conversion to Urban Areas: {scenario}")
+    ax.legend()
+    fig.tight_layout()
+    return figure_to_png(fig)
+
+# Forest conversion by destination, pivoted for every scenario in one pass over the dataset
+@st.cache_resource
+def load_forest_pivots():
+    forest_df = load_parquet_data()["Transitions from Forest Land"]
+    pivot = forest_df.pivot_table(
+        index=["scenario_name", "decade_name"], columns="to_category",
+        values="total_area", aggfunc="sum", observed=True
+    )
+    return {
+        str(name): group.droplevel("scenario_name").dropna(axis=1, how="all")
+        for name, group in pivot.groupby(level="scenario_name", observed=True)
+    }
+
+@st.cache_resource
+def build_forest_chart(scenario):
+    pivot_forest = load_forest_pivots()[scenario]
+    
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    pivot_forest.plot(kind="bar", ax=ax)
+    ax.set_xlabel("Time Period")
+    ax.set_ylabel("Acres")
+    ax.set_title(f"Forest Land Conversion by Destination: {scenario}")
+    fig.tight_layout()
+    return figure_to_png(fig)
+
+def plot_top_counties(county_df, title):
+    # Nothing to rank, so skip the groupby and figure setup entirely
+    if county_df.empty:
+        return None
+    
+    # Group by county and sum total area
+    by_county = county_df.groupby(["county_name", "state_name"], observed=True)["total_area"].sum().reset_index()
+    by_county = by_county.nlargest(10, "total_area")
+    
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    # Join county and state labels in one vectorized pass
+    labels = by_county["county_name"].astype(str).str.cat(by_county["state_name"].astype(str), sep=", ")
+    ax.bar(labels, by_county["total_area"])
+    ax.set_xlabel("County")
+    ax.set_ylabel("Acres")
+    ax.set_title(title)
+    for label in ax.get_xticklabels():
+        label.set(rotation=45, ha="right")
+    fig.tight_layout()
+    return fig
+
+# The county rankings do not depend on any widget, so each chart is rendered once per process
+@st.cache_resource
+def build_urban_counties_chart():
+    county_totals = load_county_totals()
+    # Filter for urban transitions only (where to_category is 'Urban')
+    urban_counties_df = county_totals[county_totals["to_category"] == "Urban"]
+    fig = plot_top_counties(urban_counties_df, "Top 10 Counties by Urbanization")
+    return figure_to_png(fig) if fig is not None else None
+
+@st.cache_resource
+def build_forest_loss_counties_chart():
+    county_totals = load_county_totals()
+    # Get county transitions with forest as source
+    forest_loss_counties = county_totals[(county_totals["from_category"] == "Forest") & (county_totals["to_category"] != "Forest")]
+    fig = plot_top_counties(forest_loss_counties, "Top 10 Counties by Forest Land Loss")
+    return figure_to_png(fig) if fig is not None else None
+
+# CSV export of a dataset, serialized once and reused until the user downloads it
+@st.cache_data
+def load_dataset_csv(dataset_name):
+    return to_csv_bytes(load_parquet_data()[dataset_name])
 
 # Main layout with tabs
 # tab1, tab2, tab3, tab4, tab5 = st.tabs(["Overview", "Data Explorer", "Urbanization Trends", "Forest Transitions", "Natural Language Query"])
@@ -88,7 +216,6 @@ tab1, tab2, tab3, tab4 = st.tabs(["Overview", "Data Explorer", "Urbanization Tre
 # Load data
 try:
     data = load_parquet_data()
-    rpa_docs = load_rpa_docs()
 except Exception as e:
     st.error(f"Error loading data: {e}")
     st.stop()
@@ -105,9 +232,9 @@ with tab1:
         """)
 
 # ---- DATA EXPLORER TAB ----
-with tab2:
-    st.header("Data Explorer")
-    
+# Switching datasets only re-executes the explorer, not the charts in the other tabs
+@st.fragment
+def render_data_explorer():
     # Select dataset to explore
     dataset_options = list(data.keys())
     selected_dataset = st.selectbox("Select Dataset", options=dataset_options)
@@ -128,11 +255,16 @@ with tab2:
     
     # Show column info
     st.subheader("Column Information")
+    # Take the first row once as an object array instead of indexing each column
+    if len(selected_df) > 0:
+        sample_values = [str(value) for value in selected_df.head(1).to_numpy(dtype=object)[0]]
+    else:
+        sample_values = ["Empty"] * selected_df.shape[1]
     # Convert object types to string to avoid PyArrow conversion issues
     col_df = pd.DataFrame({
         "Column": selected_df.columns,
         "Type": [str(dtype) for dtype in selected_df.dtypes],
-        "Sample Values": [str(selected_df[col].iloc[0]) if len(selected_df) > 0 else "Empty" for col in selected_df.columns]
+        "Sample Values": sample_values
     })
     st.dataframe(col_df)
     
@@ -145,7 +277,7 @@ with tab2:
     st.dataframe(preview_df)
     
     # Allow download
-    csv = selected_df.to_csv(index=False).encode('utf-8')
+    csv = load_dataset_csv(selected_dataset)
     st.download_button(
         label="Download data as CSV",
         data=csv,
@@ -153,108 +285,82 @@ with tab2:
         mime='text/csv',
     )
 
+with tab2:
+    st.header("Data Explorer")
+    render_data_explorer()
 
-# ---- URBANIZATION TRENDS TAB ----
-with tab3:
-    st.header("Urbanization Trends")
-    
+
+# Scenario controls rerun as fragments, so changing a selection only re-executes
+# that section instead of the whole page
+@st.fragment
+def render_urbanization_scenario():
     # Filter controls
     st.subheader("Explore Urbanization Trends")
     
-    urbanization_df = data["Urbanization Trends By Decade"]
-    # Convert to string for display in selectbox
-    scenarios = urbanization_df["scenario_name"].unique().tolist()
-    scenarios = [str(s) for s in scenarios]
-    selected_scenario = st.selectbox("Select Scenario", options=scenarios)
+    # The cached per-scenario split doubles as the list of scenario options
+    urban_slices = load_scenario_slices("Urbanization Trends By Decade")
+    selected_scenario = st.selectbox("Select Scenario", options=list(urban_slices))
     
-    # Filter data based on selection
-    filtered_urban = urbanization_df[urbanization_df["scenario_name"] == selected_scenario]
+    # Look up the pre-split slice for the selected scenario
+    filtered_urban = urban_slices.get(selected_scenario, data["Urbanization Trends By Decade"].iloc[0:0])
     
     # Plot the data
     st.subheader(f"Land Conversion to Urban Areas: {selected_scenario}")
     
-    fig, ax = plt.figure(figsize=(10, 6)), plt.subplot()
-    ax.plot(filtered_urban["decade_name"], filtered_urban["forest_to_urban"], marker='o', label="Forest to Urban")
-    ax.plot(filtered_urban["decade_name"], filtered_urban["cropland_to_urban"], marker='s', label="Cropland to Urban")
-    ax.plot(filtered_urban["decade_name"], filtered_urban["pasture_to_urban"], marker='^', label="Pasture to Urban")
-    ax.set_xlabel("Time Period")
-    ax.set_ylabel("Acres")
-    ax.set_title(f"Land Conversion to Urban Areas: {selected_scenario}")
-    ax.legend()
-    plt.tight_layout()
-    
-    st.pyplot(fig)
+    if not filtered_urban.empty:
+        st.image(build_urbanization_chart(selected_scenario))
     
-    with st.expander("Show Data Table"):
+    # Expander bodies run on every rerun, so the table is only built once it is switched on
+    if st.toggle("Show Data Table", key="urban_table"):
         # Convert object columns to string to avoid PyArrow conversion issues
         display_df = filtered_urban.copy()
         for col in display_df.select_dtypes(include=['object']).columns:
             display_df[col] = display_df[col].astype(str)
         st.dataframe(display_df)
-    
-    st.subheader("Top Counties Converting to Urban Land")
-    
-    # Get county transitions data 
-    county_df = data["County-Level Land Use Transitions"]
-    # Filter for urban transitions only (where to_category is 'Urban')
-    urban_counties_df = county_df[county_df["to_category"] == "Urban"]
-    
-    # Group by county and sum total area
-    urban_by_county = urban_counties_df.groupby(["county_name", "state_name"])["total_area"].sum().reset_index()
-    urban_by_county = urban_by_county.sort_values("total_area", ascending=False).head(10)
-    
-    fig2, ax2 = plt.figure(figsize=(10, 6)), plt.subplot()
-    ax2.bar(urban_by_county["county_name"] + ", " + urban_by_county["state_name"], urban_by_county["total_area"])
-    ax2.set_xlabel("County")
-    ax2.set_ylabel("Acres")
-    ax2.set_title("Top 10 Counties by Urbanization")
-    plt.xticks(rotation=45, ha="right")
-    plt.tight_layout()
-    
-    st.pyplot(fig2)
 
-# ---- FOREST TRANSITIONS TAB ----
-with tab4:
-    st.header("Forest Land Transitions")
-    
+@st.fragment
+def render_forest_scenario():
     col1, col2 = st.columns([1, 1])
     
     with col1:
-        from_forest_df = data["Transitions from Forest Land"]
-        # Convert to string for display in selectbox
-        forest_scenarios = from_forest_df["scenario_name"].unique().tolist()
-        forest_scenarios = [str(s) for s in forest_scenarios]
+        forest_slices = load_scenario_slices("Transitions from Forest Land")
         selected_scenario_forest = st.selectbox("Select Scenario", 
-                                               options=forest_scenarios,
+                                               options=list(forest_slices),
                                                key="forest_scenario")
     
-    # Filter data
-    filtered_forest = from_forest_df[from_forest_df["scenario_name"] == selected_scenario_forest]
-    
-    # Aggregate data by destination land use
-    forest_to_use = filtered_forest.groupby(["to_category", "decade_name"])["total_area"].sum().reset_index()
-    
-    # Pivot table for plotting
-    pivot_forest = forest_to_use.pivot(index="decade_name", columns="to_category", values="total_area")
+    # Look up the pre-split slice for the selected scenario
+    filtered_forest = forest_slices.get(selected_scenario_forest, data["Transitions from Forest Land"].iloc[0:0])
     
     # Plot the data
     st.subheader(f"Forest Land Conversion: {selected_scenario_forest}")
     
-    fig3, ax3 = plt.figure(figsize=(10, 6)), plt.subplot()
-    pivot_forest.plot(kind="bar", ax=ax3)
-    ax3.set_xlabel("Time Period")
-    ax3.set_ylabel("Acres")
-    ax3.set_title(f"Forest Land Conversion by Destination: {selected_scenario_forest}")
-    plt.tight_layout()
-    
-    st.pyplot(fig3)
+    if not filtered_forest.empty:
+        st.image(build_forest_chart(selected_scenario_forest))
     
-    with st.expander("Show Data Table"):
+    if st.toggle("Show Data Table", key="forest_table"):
         # Convert object columns to string to avoid PyArrow conversion issues
         display_forest_df = filtered_forest.copy()
         for col in display_forest_df.select_dtypes(include=['object']).columns:
             display_forest_df[col] = display_forest_df[col].astype(str)
         st.dataframe(display_forest_df)
+
+# ---- URBANIZATION TRENDS TAB ----
+with tab3:
+    st.header("Urbanization Trends")
+    
+    render_urbanization_scenario()
+    
+    st.subheader("Top Counties Converting to Urban Land")
+    
+    urban_counties_chart = build_urban_counties_chart()
+    if urban_counties_chart is not None:
+        st.image(urban_counties_chart)
+
+# ---- FOREST TRANSITIONS TAB ----
+with tab4:
+    st.header("Forest Land Transitions")
+    
+    render_forest_scenario()
     
     # Add additional information from RPA docs
     st.subheader("Forest Land Projections from RPA Assessment")
@@ -270,23 +376,9 @@ with tab4:
     # Add a section for county-level forest loss
     st.subheader("Top Counties with Forest Land Loss")
     
-    # Get county transitions with forest as source
-    county_df = data["County-Level Land Use Transitions"]
-    forest_loss_counties = county_df[(county_df["from_category"] == "Forest") & (county_df["to_category"] != "Forest")]
-    
-    # Group by county and sum total area
-    forest_loss_by_county = forest_loss_counties.groupby(["county_name", "state_name"])["total_area"].sum().reset_index()
-    forest_loss_by_county = forest_loss_by_county.sort_values("total_area", ascending=False).head(10)
-    
-    fig4, ax4 = plt.figure(figsize=(10, 6)), plt.subplot()
-    ax4.bar(forest_loss_by_county["county_name"] + ", " + forest_loss_by_county["state_name"], forest_loss_by_county["total_area"])
-    ax4.set_xlabel("County")
-    ax4.set_ylabel("Acres")
-    ax4.set_title("Top 10 Counties by Forest Land Loss")
-    plt.xticks(rotation=45, ha="right")
-    plt.tight_layout()
-    
-    st.pyplot(fig4)
+    forest_loss_chart = build_forest_loss_counties_chart()
+    if forest_loss_chart is not None:
+        st.image(forest_loss_chart)
         
 # ---- NATURAL LANGUAGE QUERY TAB ----
 # Commenting out Natural Language Query functionality to resolve deployment issues
@@ -349,8 +441,10 @@ with tab5:
 """
 
 # Footer
-st.markdown("---")
+# Divider and footer text go out as one markdown element
 st.markdown("""
+---
+
 **RPA Land Use Viewer** - Built with Streamlit
 
 Data Source: This dataset was developed by Mihiar, Lewis & Coulston for the USDA Forest Service for the Resources Planning Act (RPA) 2020 Assessment.
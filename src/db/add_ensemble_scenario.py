@@ -21,7 +21,6 @@ import logging
 import argparse
 from pathlib import Path
 import pandas as pd
-from tqdm import tqdm
 
 # Add the src directory to the Python path
 src_dir = Path(__file__).resolve().parent.parent
@@ -48,12 +47,11 @@ RPA_INTEGRATED_SCENARIOS = {
 
 def check_if_ensemble_exists(scenario_name):
     """Check if an ensemble scenario already exists with the given name."""
-    query = f"SELECT scenario_id FROM scenarios WHERE scenario_name = '{scenario_name}'"
-    result = DBManager.query_df(query)
+    query = "SELECT scenario_id FROM scenarios WHERE scenario_name = ?"
+    result = DBManager.execute(query, [scenario_name])
     
-    if not result.empty:
-        # Convert numpy.int32 to Python int to avoid DuckDB type errors
-        scenario_id = int(result['scenario_id'].iloc[0])
+    if result:
+        scenario_id = result[0][0]
         logger.info(f"Ensemble scenario '{scenario_name}' already exists with ID: {scenario_id}")
         return scenario_id
     
@@ -69,16 +67,23 @@ def delete_ensemble_scenario(scenario_id):
         conn.execute("DELETE FROM landuse_change WHERE scenario_id = ?", [scenario_id])
         conn.execute("DELETE FROM scenarios WHERE scenario_id = ?", [scenario_id])
 
-def get_all_scenarios():
-    """Get all existing scenarios from the database."""
-    query = "SELECT scenario_id, scenario_name, gcm, rcp, ssp FROM scenarios"
-    return DBManager.query_df(query)
+def get_source_scenario_ids(rcp=None, ssp=None):
+    """Get the IDs of non-ensemble scenarios, optionally limited to an RCP and SSP."""
+    query = """
+    SELECT scenario_id 
+    FROM scenarios 
+    WHERE scenario_name NOT LIKE '%ensemble%'
+        AND (? IS NULL OR rcp = ?)
+        AND (? IS NULL OR ssp = ?)
+    ORDER BY scenario_id
+    """
+    result = DBManager.query_df(query, [rcp, rcp, ssp, ssp])
+    return [int(scenario_id) for scenario_id in result['scenario_id']]
 
 def get_next_scenario_id():
     """Get the next available scenario ID."""
-    query = "SELECT MAX(scenario_id) + 1 AS next_id FROM scenarios"
-    result = DBManager.query_df(query)
-    return int(result['next_id'].iloc[0])  # Convert numpy.int32 to Python int
+    query = "SELECT COALESCE(MAX(scenario_id), 0) + 1 AS next_id FROM scenarios"
+    return DBManager.execute(query)[0][0]
 
 def create_ensemble_scenario(scenario_name, gcm, rcp, ssp, description):
     """Create a new scenario record for an ensemble scenario."""
@@ -97,12 +102,7 @@ def create_ensemble_scenario(scenario_name, gcm, rcp, ssp, description):
     logger.info(f"Created new ensemble scenario '{scenario_name}' with ID: {ensemble_id}")
     return ensemble_id
 
-def get_all_time_steps():
-    """Get all time steps (decades) from the database."""
-    query = "SELECT decade_id FROM decades ORDER BY decade_id"
-    return DBManager.query_df(query)['decade_id'].tolist()
-
-def calculate_and_insert_ensemble_transitions(ensemble_id, scenario_ids, batch_size=50000):
+def calculate_and_insert_ensemble_transitions(ensemble_id, scenario_ids):
     """Calculate and insert the ensemble transitions for a given set of scenario IDs."""
     if not scenario_ids:
         logger.warning("No scenarios found to average. Skipping.")
@@ -110,68 +110,33 @@ def calculate_and_insert_ensemble_transitions(ensemble_id, scenario_ids, batch_s
     
     logger.info(f"Calculating and inserting ensemble transitions for {len(scenario_ids)} scenarios")
     
-    # Get all time steps (decades)
-    time_steps = get_all_time_steps()
-    
     # Get the current max transition ID to start incrementing from
-    max_id_query = "SELECT MAX(transition_id) + 1 AS next_id FROM landuse_change"
-    max_id_result = DBManager.query_df(max_id_query)
-    next_transition_id = int(max_id_result['next_id'].iloc[0]) if not max_id_result['next_id'].isnull().iloc[0] else 1
+    max_id_query = "SELECT COALESCE(MAX(transition_id), 0) + 1 AS next_id FROM landuse_change"
+    next_transition_id = DBManager.execute(max_id_query)[0][0]
     
-    total_inserted = 0
+    # Average and insert in one statement so the rows never leave the database
+    placeholders = ','.join(['?'] * len(scenario_ids))
+    ensemble_query = f"""
+    INSERT INTO landuse_change
+    SELECT 
+        ? + ROW_NUMBER() OVER (ORDER BY decade_id, fips_code, from_landuse, to_landuse) - 1 AS transition_id,
+        ? AS scenario_id,
+        decade_id,
+        fips_code,
+        from_landuse,
+        to_landuse,
+        AVG(area_hundreds_acres) AS area_hundreds_acres
+    FROM 
+        landuse_change
+    WHERE 
+        scenario_id IN ({placeholders})
+    GROUP BY 
+        decade_id, fips_code, from_landuse, to_landuse
+    """
+    params = [next_transition_id, int(ensemble_id)] + [int(id) for id in scenario_ids]
     
-    # Process each time step (decade) separately to manage memory
-    for decade_id in tqdm(time_steps, desc="Processing decades"):
-        logger.info(f"Processing decade ID: {decade_id}")
-        
-        # Query to calculate the mean transitions for this decade
-        ensemble_query = f"""
-        SELECT 
-            decade_id,
-            fips_code,
-            from_landuse,
-            to_landuse,
-            AVG(area_hundreds_acres) AS area_hundreds_acres
-        FROM 
-            landuse_change
-        WHERE 
-            scenario_id IN ({','.join([str(id) for id in scenario_ids])})
-            AND decade_id = {decade_id}
-        GROUP BY 
-            decade_id, fips_code, from_landuse, to_landuse
-        """
-        
-        # Get the ensemble data for this decade
-        ensemble_df = DBManager.query_df(ensemble_query)
-        
-        if ensemble_df.empty:
-            logger.warning(f"No data found for decade {decade_id}")
-            continue
-        
-        # Add the ensemble scenario ID and transition IDs
-        ensemble_df['scenario_id'] = ensemble_id
-        ensemble_df['transition_id'] = range(next_transition_id, next_transition_id + len(ensemble_df))
-        next_transition_id += len(ensemble_df)
-        
-        # Process in batches to avoid memory issues
-        for start_idx in range(0, len(ensemble_df), batch_size):
-            end_idx = min(start_idx + batch_size, len(ensemble_df))
-            batch_df = ensemble_df.iloc[start_idx:end_idx]
-            
-            # Insert the batch
-            with DBManager.connection() as conn:
-                conn.register('ensemble_batch', batch_df)
-                conn.execute("""
-                    INSERT INTO landuse_change
-                    SELECT 
-                        transition_id, scenario_id, decade_id, 
-                        fips_code, from_landuse, to_landuse, area_hundreds_acres
-                    FROM 
-                        ensemble_batch
-                """)
-            
-            total_inserted += len(batch_df)
-            logger.info(f"Inserted batch of {len(batch_df)} rows. Total: {total_inserted}")
+    with DBManager.connection() as conn:
+        total_inserted = conn.execute(ensemble_query, params).fetchone()[0]
     
     logger.info(f"Successfully inserted {total_inserted} ensemble transitions")
     return total_inserted
@@ -196,10 +161,7 @@ def create_overall_ensemble(force=False):
         delete_ensemble_scenario(existing_id)
     
     # Get all scenarios (excluding any existing ensembles)
-    scenarios_df = get_all_scenarios()
-    scenarios_df = scenarios_df[~scenarios_df['scenario_name'].str.contains('ensemble')]
-    
-    scenario_ids = scenarios_df['scenario_id'].tolist()
+    scenario_ids = get_source_scenario_ids()
     logger.info(f"Found {len(scenario_ids)} scenarios to average for overall ensemble")
     
     # Create the new ensemble scenario
@@ -220,10 +182,6 @@ def create_integrated_ensembles(force=False):
     """Create ensemble scenarios for each RPA integrated scenario."""
     logger.info("Creating integrated RPA ensemble scenarios")
     
-    # Get all scenarios (excluding any existing ensembles)
-    scenarios_df = get_all_scenarios()
-    scenarios_df = scenarios_df[~scenarios_df['scenario_name'].str.contains('ensemble')]
-    
     created_ids = []
     
     # Create an ensemble for each RPA integrated scenario
@@ -245,13 +203,8 @@ def create_integrated_ensembles(force=False):
             # Delete existing ensemble scenario data
             delete_ensemble_scenario(existing_id)
         
-        # Filter scenarios matching this RPA integrated scenario (by RCP and SSP)
-        matching_scenarios = scenarios_df[
-            (scenarios_df['rcp'] == info['rcp']) & 
-            (scenarios_df['ssp'] == info['ssp'])
-        ]
-        
-        scenario_ids = matching_scenarios['scenario_id'].tolist()
+        # Non-ensemble scenarios matching this RPA integrated scenario (by RCP and SSP)
+        scenario_ids = get_source_scenario_ids(rcp=info['rcp'], ssp=info['ssp'])
         logger.info(f"Found {len(scenario_ids)} scenarios for {rpa_code} ensemble")
         
         if not scenario_ids:
@@ -50,41 +50,23 @@ class AnalysisRepository(BaseRepository):
         if filter_parts:
             filter_sql = "WHERE " + " AND ".join(filter_parts)
             
-        # Build the query
+        # Each transition is read once and counted as a loss for its source
+        # land use and a gain for its destination
         query = f"""
-        WITH from_sums AS (
-            SELECT 
-                from_landuse AS land_use_type,
-                -SUM(area_hundreds_acres * 100) AS net_change
-            FROM landuse_change 
-            {filter_sql}
-            GROUP BY from_landuse
-        ),
-        to_sums AS (
-            SELECT 
-                to_landuse AS land_use_type,
-                SUM(area_hundreds_acres * 100) AS net_change
+        SELECT 
+            CASE WHEN sign.direction < 0 THEN lc.from_landuse ELSE lc.to_landuse END AS land_use_type,
+            SUM(sign.direction * lc.area_hundreds_acres * 100) AS total_net_change
+        FROM (
+            SELECT from_landuse, to_landuse, area_hundreds_acres
             FROM landuse_change 
             {filter_sql}
-            GROUP BY to_landuse
-        ),
-        combined AS (
-            SELECT * FROM from_sums
-            UNION ALL
-            SELECT * FROM to_sums
-        )
-        SELECT 
-            land_use_type,
-            SUM(net_change) AS total_net_change
-        FROM combined
-        GROUP BY land_use_type
+        ) lc
+        CROSS JOIN (VALUES (-1), (1)) AS sign(direction)
+        GROUP BY 1
         ORDER BY total_net_change DESC
         """
         
-        # Use same parameters for both parts of the query
-        all_params = params + params if params else []
-        
-        return cls.query_to_df(query, all_params)
+        return cls.query_to_df(query, params)
     
     @classmethod
     def annualized_change_rate(
@@ -108,38 +90,19 @@ class AnalysisRepository(BaseRepository):
             scenario_filter = "WHERE lut.scenario_id = ?"
             scenario_params.append(scenario_id)
         
+        # Single scan: each transition is a loss for its source and a gain for its destination
         query = f"""
-        WITH period_changes AS (
-            SELECT 
-                d.start_year,
-                d.end_year,
-                lut.from_landuse AS land_use_type,
-                -SUM(lut.area_hundreds_acres * 100) AS acres_lost
-            FROM landuse_change lut
-            JOIN decades d ON lut.decade_id = d.decade_id
-            {scenario_filter}
-            GROUP BY d.start_year, d.end_year, lut.from_landuse
-            
-            UNION ALL
-            
-            SELECT 
+        WITH net_changes AS (
+            SELECT
                 d.start_year,
                 d.end_year,
-                lut.to_landuse AS land_use_type,
-                SUM(lut.area_hundreds_acres * 100) AS acres_gained
+                CASE WHEN sign.direction < 0 THEN lut.from_landuse ELSE lut.to_landuse END AS land_use_type,
+                SUM(sign.direction * lut.area_hundreds_acres * 100) AS net_change
             FROM landuse_change lut
             JOIN decades d ON lut.decade_id = d.decade_id
+            CROSS JOIN (VALUES (-1), (1)) AS sign(direction)
             {scenario_filter}
-            GROUP BY d.start_year, d.end_year, lut.to_landuse
-        ),
-        net_changes AS (
-            SELECT
-                start_year,
-                end_year,
-                land_use_type,
-                SUM(acres_lost) AS net_change
-            FROM period_changes
-            GROUP BY start_year, end_year, land_use_type
+            GROUP BY 1, 2, 3
         )
         SELECT
             start_year,
@@ -152,8 +115,7 @@ class AnalysisRepository(BaseRepository):
         ORDER BY start_year, annual_change_rate DESC
         """
         
-        # Duplicate parameters for both parts of the UNION
-        params = scenario_params + scenario_params if scenario_id else []
+        params = scenario_params
         
         return cls.query_to_df(query, params)
     
@@ -173,53 +135,32 @@ class AnalysisRepository(BaseRepository):
         Returns:
             DataFrame with peak change periods by land use type
         """
-        # Build filters
-        filter_parts = []
+        # The scenario filter applies to the transitions scan; the land use
+        # filter applies to the per-type ranking
+        scenario_filter = ""
+        type_filter = ""
         params = []
         
         if scenario_id:
-            filter_parts.append("lut.scenario_id = ?")
+            scenario_filter = "WHERE lut.scenario_id = ?"
             params.append(scenario_id)
         
         if land_use_type:
-            filter_parts.append("land_use_type = ?")
+            type_filter = "WHERE land_use_type = ?"
             params.append(land_use_type)
-        
-        # Create WHERE clause
-        filter_sql = ""
-        if filter_parts:
-            filter_sql = "WHERE " + " AND ".join(filter_parts)
             
         query = f"""
-        WITH period_changes AS (
-            SELECT 
-                d.start_year,
-                d.end_year,
-                lut.from_landuse AS land_use_type,
-                -SUM(lut.area_hundreds_acres * 100) AS net_change
-            FROM landuse_change lut
-            JOIN decades d ON lut.decade_id = d.decade_id
-            GROUP BY d.start_year, d.end_year, lut.from_landuse
-            
-            UNION ALL
-            
-            SELECT 
+        WITH net_changes AS (
+            SELECT
                 d.start_year,
                 d.end_year,
-                lut.to_landuse AS land_use_type,
-                SUM(lut.area_hundreds_acres * 100) AS net_change
+                CASE WHEN sign.direction < 0 THEN lut.from_landuse ELSE lut.to_landuse END AS land_use_type,
+                SUM(sign.direction * lut.area_hundreds_acres * 100) AS total_net_change
             FROM landuse_change lut
             JOIN decades d ON lut.decade_id = d.decade_id
-            GROUP BY d.start_year, d.end_year, lut.to_landuse
-        ),
-        net_changes AS (
-            SELECT
-                start_year,
-                end_year,
-                land_use_type,
-                SUM(net_change) AS total_net_change
-            FROM period_changes
-            GROUP BY start_year, end_year, land_use_type
+            CROSS JOIN (VALUES (-1), (1)) AS sign(direction)
+            {scenario_filter}
+            GROUP BY 1, 2, 3
         ),
         ranked_changes AS (
             SELECT
@@ -230,7 +171,7 @@ class AnalysisRepository(BaseRepository):
                 ABS(total_net_change) AS abs_change,
                 ROW_NUMBER() OVER (PARTITION BY land_use_type ORDER BY ABS(total_net_change) DESC) AS rank
             FROM net_changes
-            {filter_sql}
+            {type_filter}
         )
         SELECT
             land_use_type,
@@ -264,38 +205,26 @@ class AnalysisRepository(BaseRepository):
         Returns:
             DataFrame with major transitions
         """
-        # Find time periods that match the years
-        time_periods_query = """
-        SELECT decade_id 
-        FROM decades 
-        WHERE NOT (end_year <= ? OR start_year >= ?)
-        ORDER BY start_year
-        """
-        
-        time_periods_df = cls.query_to_df(time_periods_query, [start_year, end_year])
-        
-        if time_periods_df.empty:
-            # Fall back to closest period
-            closest_query = """
+        # Matching decades (or the closest one when none overlap) are resolved
+        # inside the same statement as the aggregation
+        query = """
+        WITH overlapping_decades AS (
+            SELECT decade_id 
+            FROM decades 
+            WHERE NOT (end_year <= ? OR start_year >= ?)
+        ),
+        closest_decade AS (
             SELECT decade_id
             FROM decades
             ORDER BY ABS(? - start_year) + ABS(? - end_year)
             LIMIT 1
-            """
-            closest_df = cls.query_to_df(closest_query, [start_year, end_year])
-            
-            if not closest_df.empty:
-                decade_ids = closest_df['decade_id'].tolist()
-            else:
-                logger.warning("No matching time periods found")
-                return pd.DataFrame()
-        else:
-            decade_ids = time_periods_df['decade_id'].tolist()
-        
-        # Build query with placeholders for decade_ids
-        time_placeholders = ','.join(['?'] * len(decade_ids))
-        
-        query = f"""
+        ),
+        matching_decades AS (
+            SELECT decade_id FROM overlapping_decades
+            UNION ALL
+            SELECT decade_id FROM closest_decade
+            WHERE NOT EXISTS (SELECT 1 FROM overlapping_decades)
+        )
         SELECT 
             from_landuse,
             to_landuse,
@@ -303,16 +232,8 @@ class AnalysisRepository(BaseRepository):
         FROM 
             landuse_change
         WHERE 
-            decade_id IN ({time_placeholders})
-        """
-        
-        params = decade_ids.copy()
-        
-        if scenario_id:
-            query += " AND scenario_id = ?"
-            params.append(scenario_id)
-            
-        query += """
+            decade_id IN (SELECT decade_id FROM matching_decades)
+            AND (? IS NULL OR scenario_id = ?)
         GROUP BY 
             from_landuse, to_landuse
         ORDER BY 
@@ -320,7 +241,7 @@ class AnalysisRepository(BaseRepository):
         LIMIT ?
         """
         
-        params.append(limit)
+        params = [start_year, end_year, start_year, end_year, scenario_id, scenario_id, limit]
         
         return cls.query_to_df(query, params)
     
@@ -346,142 +267,82 @@ class AnalysisRepository(BaseRepository):
         Returns:
             DataFrame with comparison results
         """
-        # Get scenario IDs
-        scenarios_query = """
-        SELECT scenario_id, scenario_name
-        FROM scenarios
-        WHERE scenario_name IN (?, ?)
-        """
-        
-        scenarios_df = cls.query_to_df(scenarios_query, [scenario_1, scenario_2])
-        
-        if len(scenarios_df) < 2:
-            logger.warning("Could not find both scenarios")
-            return pd.DataFrame()
-        
-        # Find matching time periods
-        time_periods_query = """
-        SELECT decade_id 
-        FROM decades 
-        WHERE NOT (end_year <= ? OR start_year >= ?)
-        ORDER BY start_year
-        """
-        
-        time_periods_df = cls.query_to_df(time_periods_query, [start_year, end_year])
-        
-        if time_periods_df.empty:
-            logger.warning("No matching time periods found")
-            return pd.DataFrame()
-            
-        decade_ids = time_periods_df['decade_id'].tolist()
-        
-        # Build query for each scenario
-        time_placeholders = ','.join(['?'] * len(decade_ids))
-        
-        # Complex query to compare net changes for the specific land use type
-        query = f"""
-        WITH scenario1_changes AS (
-            -- From changes (losses)
-            SELECT 
-                'from' as direction,
-                from_landuse as land_use,
-                to_landuse as conversion,
-                -SUM(area_hundreds_acres * 100) as acres_changed
-            FROM 
-                landuse_change
-            WHERE 
-                scenario_id = ? AND
-                decade_id IN ({time_placeholders}) AND
-                from_landuse = ?
-            GROUP BY 
-                from_landuse, to_landuse
-                
-            UNION ALL
-            
-            -- To changes (gains)
+        # Scenario IDs and matching decades are resolved inside the same statement,
+        # and each direction scans both scenarios at once with conditional sums
+        query = """
+        WITH matching_decades AS (
+            SELECT decade_id 
+            FROM decades 
+            WHERE NOT (end_year <= ? OR start_year >= ?)
+        ),
+        selected_scenarios AS (
             SELECT 
-                'to' as direction,
-                to_landuse as land_use,
-                from_landuse as conversion,
-                SUM(area_hundreds_acres * 100) as acres_changed
+                MAX(CASE WHEN scenario_name = ? THEN scenario_id END) as scenario1_id,
+                MAX(CASE WHEN scenario_name = ? THEN scenario_id END) as scenario2_id
             FROM 
-                landuse_change
-            WHERE 
-                scenario_id = ? AND
-                decade_id IN ({time_placeholders}) AND
-                to_landuse = ?
-            GROUP BY 
-                to_landuse, from_landuse
+                scenarios
         ),
-        scenario2_changes AS (
+        scenario_changes AS (
             -- From changes (losses)
             SELECT 
                 'from' as direction,
-                from_landuse as land_use,
-                to_landuse as conversion,
-                -SUM(area_hundreds_acres * 100) as acres_changed
+                t.from_landuse as land_use,
+                t.to_landuse as conversion,
+                -SUM(CASE WHEN t.scenario_id = s.scenario1_id THEN t.area_hundreds_acres * 100 END) as scenario1_change,
+                -SUM(CASE WHEN t.scenario_id = s.scenario2_id THEN t.area_hundreds_acres * 100 END) as scenario2_change
             FROM 
-                landuse_change
+                landuse_change t, selected_scenarios s
             WHERE 
-                scenario_id = ? AND
-                decade_id IN ({time_placeholders}) AND
-                from_landuse = ?
+                t.scenario_id IN (s.scenario1_id, s.scenario2_id) AND
+                t.decade_id IN (SELECT decade_id FROM matching_decades) AND
+                t.from_landuse = ?
             GROUP BY 
-                from_landuse, to_landuse
+                t.from_landuse, t.to_landuse
                 
             UNION ALL
             
             -- To changes (gains)
             SELECT 
                 'to' as direction,
-                to_landuse as land_use,
-                from_landuse as conversion,
-                SUM(area_hundreds_acres * 100) as acres_changed
+                t.to_landuse as land_use,
+                t.from_landuse as conversion,
+                SUM(CASE WHEN t.scenario_id = s.scenario1_id THEN t.area_hundreds_acres * 100 END) as scenario1_change,
+                SUM(CASE WHEN t.scenario_id = s.scenario2_id THEN t.area_hundreds_acres * 100 END) as scenario2_change
             FROM 
-                landuse_change
+                landuse_change t, selected_scenarios s
             WHERE 
-                scenario_id = ? AND
-                decade_id IN ({time_placeholders}) AND
-                to_landuse = ?
+                t.scenario_id IN (s.scenario1_id, s.scenario2_id) AND
+                t.decade_id IN (SELECT decade_id FROM matching_decades) AND
+                t.to_landuse = ?
             GROUP BY 
-                to_landuse, from_landuse
+                t.to_landuse, t.from_landuse
         )
         SELECT
-            s1.direction,
-            s1.land_use,
-            s1.conversion,
-            s1.acres_changed as scenario1_change,
-            s2.acres_changed as scenario2_change,
-            (s1.acres_changed - s2.acres_changed) as difference,
-            ((s1.acres_changed - s2.acres_changed) / ABS(NULLIF(s2.acres_changed, 0))) * 100 as percent_difference
+            direction,
+            land_use,
+            conversion,
+            scenario1_change,
+            scenario2_change,
+            (scenario1_change - scenario2_change) as difference,
+            ((scenario1_change - scenario2_change) / ABS(NULLIF(scenario2_change, 0))) * 100 as percent_difference
         FROM
-            scenario1_changes s1
-        JOIN
-            scenario2_changes s2 ON s1.direction = s2.direction AND s1.land_use = s2.land_use AND s1.conversion = s2.conversion
+            scenario_changes
+        WHERE
+            -- Only transitions present in both scenarios are compared
+            scenario1_change IS NOT NULL AND scenario2_change IS NOT NULL
         ORDER BY
-            ABS(s1.acres_changed - s2.acres_changed) DESC
+            ABS(scenario1_change - scenario2_change) DESC
         """
         
-        # Prepare parameters
-        scenario1_id = scenarios_df.loc[scenarios_df['scenario_name'] == scenario_1, 'scenario_id'].iloc[0]
-        scenario2_id = scenarios_df.loc[scenarios_df['scenario_name'] == scenario_2, 'scenario_id'].iloc[0]
-        
         params = [
-            # Scenario 1 params - from
-            scenario1_id,
-            *decade_ids,
-            land_use_type,
-            # Scenario 1 params - to
-            scenario1_id,
-            *decade_ids,
-            land_use_type,
-            # Scenario 2 params - from
-            scenario2_id,
-            *decade_ids,
+            # Time range params
+            start_year,
+            end_year,
+            # Scenario names
+            scenario_1,
+            scenario_2,
+            # Land use type for the from and to changes
             land_use_type,
-            # Scenario 2 params - to
-            scenario2_id,
-            *decade_ids,
             land_use_type
         ]
         
@@ -61,9 +61,9 @@ class BaseRepository:
         Returns:
             Single scalar value or None
         """
-        results = cls.execute_query(query, params)
-        if results and len(results) > 0 and len(results[0]) > 0:
-            return results[0][0]
+        row = DBManager.fetchone(query, params)
+        if row:
+            return row[0]
         return None
     
     @classmethod
@@ -78,10 +78,7 @@ class BaseRepository:
         Returns:
             Row as dictionary or None
         """
-        df = cls.query_to_df(query, params)
-        if df.empty:
-            return None
-        return df.iloc[0].to_dict()
+        return DBManager.query_row(query, params)
     
     @classmethod
     def check_exists(cls, query: str, params: Optional[List] = None) -> bool:
@@ -3,10 +3,12 @@ Database connection module for RPA land use viewer.
 """
 
 import os
+import atexit
 import logging
+import threading
 import contextlib
 from pathlib import Path
-from typing import Optional, Any
+from typing import Optional, Any, Dict
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -16,7 +18,11 @@ logger = logging.getLogger(__name__)
 
 # Database configuration
 DB_CONFIG = {
-    'database_path': os.getenv('DB_PATH', 'data/database/rpa.db')
+    'database_path': os.getenv('DB_PATH', 'data/database/rpa.db'),
+    'threads': int(os.getenv('DB_THREADS', '4')),
+    # Unset leaves DuckDB's default (a share of system memory)
+    'memory_limit': os.getenv('DB_MEMORY_LIMIT'),
+    'temp_directory': os.getenv('DB_TEMP_DIRECTORY')
 }
 
 class DBManager:
@@ -30,6 +36,7 @@ class DBManager:
     """
     
     _pool = None
+    _pool_lock = threading.Lock()
     
     @classmethod
     def _ensure_db_exists(cls) -> str:
@@ -39,16 +46,73 @@ class DBManager:
         path_obj.parent.mkdir(parents=True, exist_ok=True)
         return str(path_obj.absolute())
     
+    @classmethod
+    def _pool_config(cls) -> Dict[str, Any]:
+        """Return the DuckDB settings the shared connection is opened with."""
+        config = {'threads': DB_CONFIG['threads']}
+        if DB_CONFIG['memory_limit']:
+            config['memory_limit'] = DB_CONFIG['memory_limit']
+        if DB_CONFIG['temp_directory']:
+            # Large aggregations spill here instead of failing at the memory limit
+            config['temp_directory'] = DB_CONFIG['temp_directory']
+        return config
+    
+    @classmethod
+    def _get_pool(cls):
+        """Return the shared root connection, opening it on first use."""
+        if cls._pool is None:
+            with cls._pool_lock:
+                # Re-check under the lock so concurrent callers open only one connection
+                if cls._pool is None:
+                    import duckdb
+                    db_path = cls._ensure_db_exists()
+                    # Settings apply to the whole database instance, so every cursor
+                    # handed out from the pool inherits them. They are passed as
+                    # connection config so configured values never become SQL text.
+                    pool = duckdb.connect(db_path, config=cls._pool_config())
+                    cls._pool = pool
+        return cls._pool
+    
+    @classmethod
+    def close_pool(cls) -> None:
+        """Close the shared root connection so the database file is released."""
+        with cls._pool_lock:
+            if cls._pool is not None:
+                try:
+                    cls._pool.close()
+                except Exception as e:
+                    logger.warning(f"Error closing pooled connection: {e}")
+                cls._pool = None
+    
+    @classmethod
+    def database_signature(cls) -> tuple:
+        """
+        Return a cheap fingerprint of the database files on disk.
+        
+        DuckDB appends every committed write to the WAL and folds it into the
+        database file on checkpoint, so the modification time and size of the
+        two files change whenever the data does, whichever process wrote it.
+        
+        Returns:
+            Tuple of (mtime_ns, size) pairs for the database and its WAL, with
+            None for a file that does not exist
+        """
+        db_path = DB_CONFIG['database_path']
+        signature = []
+        for path in (db_path, f"{db_path}.wal"):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+    
     @classmethod
     def get_connection(cls):
         """Get a connection from the pool or create a new one."""
         try:
-            import duckdb
-            db_path = cls._ensure_db_exists()
-            connection = duckdb.connect(db_path)
-            # Set the number of threads for concurrent processing
-            connection.execute("SET threads=4")
-            return connection
+            # Cursors share the pooled database instance, so no file open or setup per call
+            return cls._get_pool().cursor()
         except Exception as err:
             logger.error(f"Error connecting to DuckDB: {err}")
             raise
@@ -67,10 +131,39 @@ class DBManager:
         finally:
             if conn:
                 try:
+                    # Closes only the cursor; the pooled connection stays open
                     conn.close()
                 except Exception as e:
                     logger.warning(f"Error closing connection: {e}")
     
+    @classmethod
+    @contextlib.contextmanager
+    def scoped_settings(cls, conn, **settings):
+        """
+        Apply DuckDB settings for the duration of a block.
+        
+        Settings such as threads and memory_limit are global to the database
+        instance, so setting them on a pooled cursor changes every other cursor
+        too. On exit each setting goes back to the pool's configured value, or
+        to DuckDB's default when the pool does not configure it.
+        
+        Args:
+            conn: Connection or cursor from this manager
+            **settings: Setting names and values; None leaves a setting untouched
+        """
+        applied = [name for name, value in settings.items() if value is not None]
+        try:
+            for name in applied:
+                conn.execute(f"SET {name} = ?", [settings[name]])
+            yield conn
+        finally:
+            pool_config = cls._pool_config()
+            for name in applied:
+                if name in pool_config:
+                    conn.execute(f"SET {name} = ?", [pool_config[name]])
+                else:
+                    conn.execute(f"RESET {name}")
+    
     @classmethod
     def query_df(cls, query: str, params: Optional[list] = None):
         """
@@ -98,6 +191,58 @@ class DBManager:
                 logger.debug(f"Params: {params}")
                 return pd.DataFrame()
     
+    @classmethod
+    def fetchone(cls, query: str, params: Optional[list] = None) -> Optional[tuple]:
+        """
+        Execute a SQL query and return only its first row.
+        
+        Only one row is pulled from the result, so no DataFrame or row list
+        is built for single-row lookups.
+        
+        Args:
+            query: SQL query with ? placeholders
+            params: List of parameters for the query
+            
+        Returns:
+            First row as a tuple, or None if there are no rows
+        """
+        with cls.connection() as conn:
+            try:
+                if params:
+                    return conn.execute(query, params).fetchone()
+                else:
+                    return conn.execute(query).fetchone()
+            except Exception as err:
+                logger.error(f"Query failed: {err}")
+                logger.debug(f"Query: {query}")
+                logger.debug(f"Params: {params}")
+                return None
+    
+    @classmethod
+    def query_row(cls, query: str, params: Optional[list] = None) -> Optional[Dict[str, Any]]:
+        """
+        Execute a SQL query and return its first row as a dictionary.
+        
+        Args:
+            query: SQL query with ? placeholders
+            params: List of parameters for the query
+            
+        Returns:
+            First row keyed by column name, or None if there are no rows
+        """
+        with cls.connection() as conn:
+            try:
+                cursor = conn.execute(query, params) if params else conn.execute(query)
+                row = cursor.fetchone()
+                if row is None:
+                    return None
+                return dict(zip((column[0] for column in cursor.description), row))
+            except Exception as err:
+                logger.error(f"Query failed: {err}")
+                logger.debug(f"Query: {query}")
+                logger.debug(f"Params: {params}")
+                return None
+    
     @classmethod
     def execute(cls, query: str, params: Optional[list] = None) -> Any:
         """
@@ -120,4 +265,8 @@ class DBManager:
                 logger.error(f"Query execution failed: {err}")
                 logger.debug(f"Query: {query}")
                 logger.debug(f"Params: {params}")
-                return [] 
\ No newline at end of file
+                return []
+
+
+# Release the pooled connection when the interpreter exits
+atexit.register(DBManager.close_pool)
@@ -15,6 +15,7 @@ import logging
 import argparse
 from pathlib import Path
 from tqdm import tqdm
+import numpy as np
 import pandas as pd
 
 # Add the src directory to the Python path
@@ -35,6 +36,9 @@ logger = logging.getLogger("data-import")
 # Default JSON data path
 DEFAULT_JSON_PATH = "data/raw/county_landuse_projections_RPA.json"
 
+# Destination land use columns in each transition-matrix row
+TO_LAND_USE_CODES = ['cr', 'ps', 'rg', 'fr', 'ur']
+
 def setup_database():
     """Ensure database is initialized before importing data."""
     SchemaManager.initialize_database()
@@ -155,12 +159,60 @@ def insert_counties(json_data):
     logger.info(f"Inserted {len(counties)} counties")
     return list(counties)
 
+def build_transition_rows(time_step_data, scenario_id, time_step_id, first_transition_id):
+    """
+    Flatten one time step of county transition matrices into transition rows.
+    
+    Args:
+        time_step_data: Dict mapping FIPS codes to lists of matrix rows, each
+            with a '_row' source land use and one area per destination code
+        scenario_id: Scenario ID for every row
+        time_step_id: Time step ID for every row
+        first_transition_id: ID assigned to the first row; the rest follow on
+        
+    Returns:
+        DataFrame in land_use_transitions column order with one row per positive
+        area, in county -> source -> destination order
+    """
+    columns = [
+        'transition_id', 'scenario_id', 'time_step_id', 'fips_code',
+        'from_land_use', 'to_land_use', 'area_hundreds_acres'
+    ]
+    
+    # One frame per time step: a row per county transition-matrix row
+    rows_df = pd.DataFrame([
+        {**row_data, 'fips_code': fips_code}
+        for fips_code, county_data in time_step_data.items()
+        for row_data in county_data
+        if row_data.get('_row')
+    ])
+    if rows_df.empty:
+        return pd.DataFrame(columns=columns)
+    
+    # Stack the matrix columns into (county, from, to) rows in the original
+    # county -> row -> land use order, keeping only positive areas
+    areas = (
+        rows_df.set_index(['fips_code', '_row'])
+        .reindex(columns=TO_LAND_USE_CODES)
+        .fillna(0)
+        .stack()
+    )
+    areas = areas[areas > 0]
+    
+    return pd.DataFrame({
+        'transition_id': np.arange(first_transition_id, first_transition_id + len(areas)),
+        'scenario_id': scenario_id,
+        'time_step_id': time_step_id,
+        'fips_code': areas.index.get_level_values(0),
+        'from_land_use': areas.index.get_level_values(1),
+        'to_land_use': areas.index.get_level_values(2),
+        'area_hundreds_acres': areas.to_numpy()
+    }, columns=columns)
+
 def process_transitions(json_data, scenario_map, time_step_map, counties):
     """Process and insert land use transition data."""
     logger.info("Processing land use transitions")
     
-    # We'll process batches of records for memory efficiency
-    batch_size = 100000
     transition_id = 1
     total_transitions = 0
     
@@ -174,53 +226,23 @@ def process_transitions(json_data, scenario_map, time_step_map, counties):
                                                       desc=f"Time steps in {scenario_name}", 
                                                       leave=False):
                 time_step_id = time_step_map[time_step_name]
-                transitions = []
                 
-                # For each county
-                for fips_code, county_data in time_step_data.items():
-                    # Process each row in the transition matrix
-                    for row_data in county_data:
-                        from_land_use = row_data.get('_row')
-                        if not from_land_use:
-                            continue
-                            
-                        # Extract transitions to each land use type
-                        for to_land_use in ['cr', 'ps', 'rg', 'fr', 'ur']:
-                            area = row_data.get(to_land_use, 0)
-                            if area > 0:
-                                transitions.append({
-                                    'transition_id': transition_id,
-                                    'scenario_id': scenario_id,
-                                    'time_step_id': time_step_id,
-                                    'fips_code': fips_code,
-                                    'from_land_use': from_land_use,
-                                    'to_land_use': to_land_use,
-                                    'area_hundreds_acres': area
-                                })
-                                transition_id += 1
-                    
-                    # Insert batch if we've reached batch size
-                    if len(transitions) >= batch_size:
-                        transitions_df = pd.DataFrame(transitions)
-                        conn.register('transitions_temp', transitions_df)
-                        conn.execute("""
-                            INSERT INTO land_use_transitions 
-                            SELECT * FROM transitions_temp
-                        """)
-                        total_transitions += len(transitions)
-                        transitions = []
-                        logger.info(f"Inserted batch - Total transitions: {total_transitions}")
+                transitions_df = build_transition_rows(
+                    time_step_data, scenario_id, time_step_id, transition_id
+                )
+                if transitions_df.empty:
+                    continue
+                
+                transition_id += len(transitions_df)
                 
-                # Insert any remaining transitions for this time step
-                if transitions:
-                    transitions_df = pd.DataFrame(transitions)
-                    conn.register('transitions_temp', transitions_df)
-                    conn.execute("""
-                        INSERT INTO land_use_transitions 
-                        SELECT * FROM transitions_temp
-                    """)
-                    total_transitions += len(transitions)
-                    logger.info(f"Inserted batch - Total transitions: {total_transitions}")
+                conn.register('transitions_temp', transitions_df)
+                conn.execute("""
+                    INSERT INTO land_use_transitions 
+                    SELECT * FROM transitions_temp
+                """)
+                conn.unregister('transitions_temp')
+                total_transitions += len(transitions_df)
+                logger.info(f"Inserted batch - Total transitions: {total_transitions}")
     
     logger.info(f"Inserted {total_transitions} land use transitions in total")
 
@@ -13,7 +13,6 @@ import sys
 import logging
 import argparse
 from pathlib import Path
-from tqdm import tqdm
 import pandas as pd
 
 # Add the src directory to the Python path
@@ -194,76 +193,40 @@ def process_transitions(df, scenario_map, decade_map):
     """Process and insert land use transition data from the DataFrame."""
     logger.info("Processing land use transitions")
     
-    # We'll process batches of records for memory efficiency
-    batch_size = 100000
-    transition_id = 1
-    total_transitions = 0
-    unknown_landuse_types = set()
+    # Map land use names to database codes in one vectorized pass
+    from_codes = df['From'].map(LANDUSE_NAME_TO_CODE)
+    to_codes = df['To'].map(LANDUSE_NAME_TO_CODE)
     
-    # Prepare the needed columns for transitions
-    transitions = []
+    # Skip records with unknown land use types
+    valid = from_codes.notna() & to_codes.notna()
+    unknown_landuse_types = (
+        set(df.loc[from_codes.isna(), 'From']) | set(df.loc[to_codes.isna(), 'To'])
+    )
+    
+    transitions_df = pd.DataFrame({
+        'transition_id': range(1, int(valid.sum()) + 1),
+        'scenario_id': df.loc[valid, 'Scenario'].map(scenario_map).to_numpy(),
+        'decade_id': df.loc[valid, 'YearRange'].map(decade_map).to_numpy(),
+        'fips_code': df.loc[valid, 'FIPS'].to_numpy(),
+        'from_landuse': from_codes[valid].to_numpy(),
+        'to_landuse': to_codes[valid].to_numpy(),
+        'area_hundreds_acres': df.loc[valid, 'Acres'].to_numpy()
+    })
     
     with DBManager.connection() as conn:
-        # Process each row in the DataFrame
-        for index, row in tqdm(df.iterrows(), total=len(df), desc="Processing transitions"):
-            scenario_id = scenario_map[row['Scenario']]
-            decade_id = decade_map[row['YearRange']]
-            
-            # Map the land use types from names to codes
-            from_landuse = row['From']
-            to_landuse = row['To']
-            
-            # Convert to database codes using the mapping
-            from_code = LANDUSE_NAME_TO_CODE.get(from_landuse)
-            to_code = LANDUSE_NAME_TO_CODE.get(to_landuse)
-            
-            # Skip records with unknown land use types
-            if from_code is None:
-                unknown_landuse_types.add(from_landuse)
-                continue
-            if to_code is None:
-                unknown_landuse_types.add(to_landuse)
-                continue
-            
-            transitions.append({
-                'transition_id': transition_id,
-                'scenario_id': scenario_id,
-                'decade_id': decade_id,
-                'fips_code': row['FIPS'],
-                'from_landuse': from_code,
-                'to_landuse': to_code,
-                'area_hundreds_acres': row['Acres']
-            })
-            transition_id += 1
-            
-            # Insert batch if we've reached batch size
-            if len(transitions) >= batch_size:
-                transitions_df = pd.DataFrame(transitions)
-                conn.register('transitions_temp', transitions_df)
-                conn.execute("""
-                    INSERT INTO landuse_change
-                    SELECT * FROM transitions_temp
-                """)
-                total_transitions += len(transitions)
-                transitions = []
-                logger.info(f"Inserted batch - Total transitions: {total_transitions}")
-        
-        # Insert any remaining transitions
-        if transitions:
-            transitions_df = pd.DataFrame(transitions)
-            conn.register('transitions_temp', transitions_df)
-            conn.execute("""
-                INSERT INTO landuse_change
-                SELECT * FROM transitions_temp
-            """)
-            total_transitions += len(transitions)
-            logger.info(f"Inserted batch - Total transitions: {total_transitions}")
+        # Single bulk insert from the registered DataFrame
+        conn.register('transitions_temp', transitions_df)
+        conn.execute("""
+            INSERT INTO landuse_change
+            SELECT * FROM transitions_temp
+        """)
+        conn.unregister('transitions_temp')
     
     # Log any unknown land use types
     if unknown_landuse_types:
         logger.warning(f"Found {len(unknown_landuse_types)} unknown land use types: {unknown_landuse_types}")
     
-    logger.info(f"Inserted {total_transitions} land use transitions in total")
+    logger.info(f"Inserted {len(transitions_df)} land use transitions in total")
 
 def main():
     """Main function to import data."""
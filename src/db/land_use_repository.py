@@ -6,15 +6,47 @@ time steps, and transitions.
 """
 
 import logging
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Tuple
 import pandas as pd
 from .base_repository import BaseRepository
+from .database import DBManager
 
 logger = logging.getLogger(__name__)
 
 class LandUseRepository(BaseRepository):
     """Repository for accessing land use data."""
     
+    # Dimension tables change only when data is imported or ensembles are added,
+    # so each is cached together with the database signature it was read under
+    _dimension_cache: Dict[str, Tuple[tuple, pd.DataFrame]] = {}
+    
+    @classmethod
+    def _cached_dimension(cls, key: str, query: str) -> pd.DataFrame:
+        """
+        Return a dimension table, re-querying only when the database has changed.
+        
+        Args:
+            key: Cache key for the dimension
+            query: SQL query that loads the dimension
+            
+        Returns:
+            Copy of the cached DataFrame, so callers cannot mutate the cache
+        """
+        signature = DBManager.database_signature()
+        cached = cls._dimension_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1].copy()
+        
+        df = cls.query_to_df(query)
+        if not df.empty:
+            cls._dimension_cache[key] = (signature, df)
+        return df.copy()
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Discard cached dimension tables."""
+        cls._dimension_cache.clear()
+    
     @classmethod
     def get_scenarios(cls) -> pd.DataFrame:
         """
@@ -35,7 +67,7 @@ class LandUseRepository(BaseRepository):
         ORDER BY 
             scenario_name
         """
-        return cls.query_to_df(query)
+        return cls._cached_dimension('scenarios', query)
     
     @classmethod
     def get_time_steps(cls) -> pd.DataFrame:
@@ -55,7 +87,7 @@ class LandUseRepository(BaseRepository):
         ORDER BY 
             start_year
         """
-        return cls.query_to_df(query)
+        return cls._cached_dimension('time_steps', query)
     
     @classmethod
     def get_counties(cls) -> pd.DataFrame:
@@ -74,23 +106,25 @@ class LandUseRepository(BaseRepository):
         ORDER BY 
             county_name
         """
-        return cls.query_to_df(query)
+        return cls._cached_dimension('counties', query)
     
     @classmethod
     def get_land_use_types(cls) -> List[str]:
         """
-        Get all land use types from the transitions.
+        Get all land use types.
+        
+        Reads the small landuse_types lookup table rather than scanning
+        every transition row for distinct codes.
         
         Returns:
             List of unique land use types
         """
         query = """
-        SELECT DISTINCT from_landuse as land_use_type FROM landuse_change
-        UNION
-        SELECT DISTINCT to_landuse as land_use_type FROM landuse_change
+        SELECT landuse_type_code as land_use_type
+        FROM landuse_types
         ORDER BY land_use_type
         """
-        df = cls.query_to_df(query)
+        df = cls._cached_dimension('land_use_types', query)
         if df.empty:
             return []
         return df['land_use_type'].tolist()
@@ -187,7 +221,8 @@ class LandUseRepository(BaseRepository):
         scenario_id: int,
         time_step_ids: List[int],
         fips_code: Optional[str] = None,
-        land_use_type: Optional[str] = None
+        land_use_type: Optional[str] = None,
+        use_materialized: bool = False
     ) -> pd.DataFrame:
         """
         Get land use transitions filtered by parameters.
@@ -197,6 +232,10 @@ class LandUseRepository(BaseRepository):
             time_step_ids: List of time step IDs
             fips_code: Optional county FIPS code
             land_use_type: Optional land use type
+            use_materialized: Read national totals from mat_national_transitions
+                when no county filter is given and the table exists. The table
+                is a snapshot from the last view refresh, so scenarios added
+                since then are only visible with the default base-table path
             
         Returns:
             DataFrame with transition information
@@ -204,17 +243,31 @@ class LandUseRepository(BaseRepository):
         # Build the query with placeholders for time_step_ids
         time_placeholders = ','.join(['?'] * len(time_step_ids))
         
-        query = f"""
-        SELECT 
-            t.from_landuse as from_land_use,
-            t.to_landuse as to_land_use,
-            SUM(t.area_hundreds_acres * 100) as acres_changed
-        FROM 
-            landuse_change t
-        WHERE 
-            t.scenario_id = ? 
-            AND t.decade_id IN ({time_placeholders})
-        """
+        if not fips_code and use_materialized and cls._table_exists('mat_national_transitions'):
+            # National totals are pre-aggregated, so only the small summary table is scanned
+            query = f"""
+            SELECT 
+                t.from_landuse as from_land_use,
+                t.to_landuse as to_land_use,
+                SUM(t.total_area * 100) as acres_changed
+            FROM 
+                mat_national_transitions t
+            WHERE 
+                t.scenario_id = ? 
+                AND t.decade_id IN ({time_placeholders})
+            """
+        else:
+            query = f"""
+            SELECT 
+                t.from_landuse as from_land_use,
+                t.to_landuse as to_land_use,
+                SUM(t.area_hundreds_acres * 100) as acres_changed
+            FROM 
+                landuse_change t
+            WHERE 
+                t.scenario_id = ? 
+                AND t.decade_id IN ({time_placeholders})
+            """
         
         params = [scenario_id] + time_step_ids
         
@@ -233,4 +286,21 @@ class LandUseRepository(BaseRepository):
             acres_changed DESC
         """
         
-        return cls.query_to_df(query, params) 
\ No newline at end of file
+        return cls.query_to_df(query, params)
+    
+    @classmethod
+    def _table_exists(cls, table_name: str) -> bool:
+        """
+        Check whether a table exists in the database catalog.
+        
+        Args:
+            table_name: Name of the table
+            
+        Returns:
+            True if the table exists, False otherwise
+        """
+        query = """
+        SELECT 1 FROM information_schema.tables
+        WHERE table_name = ?
+        """
+        return cls.check_exists(query, [table_name])
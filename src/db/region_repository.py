@@ -7,6 +7,7 @@ including counties, states, and RPA regions.
 
 import logging
 import os
+import shutil
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union
 import pandas as pd
@@ -90,6 +91,26 @@ class RegionRepository(BaseRepository):
         GROUP BY 
             s.scenario_id, s.scenario_name, t.decade_id, d.decade_name,
             c.state_name, c.region, c.subregion, t.from_landuse, t.to_landuse
+        """,
+        
+        'national_transitions': """
+        SELECT 
+            s.scenario_id, 
+            s.scenario_name,
+            t.decade_id,
+            d.decade_name,
+            t.from_landuse,
+            t.to_landuse,
+            SUM(t.area_hundreds_acres) AS total_area
+        FROM 
+            landuse_change t
+        JOIN 
+            scenarios s ON t.scenario_id = s.scenario_id
+        JOIN 
+            decades d ON t.decade_id = d.decade_id
+        GROUP BY 
+            s.scenario_id, s.scenario_name, t.decade_id, d.decade_name,
+            t.from_landuse, t.to_landuse
         """
     }
     
@@ -320,11 +341,10 @@ class RegionRepository(BaseRepository):
         """
         logger.info("Creating materialized views for regional analysis")
         
-        with DBManager.connection() as conn:
-            # Set up optimizations
-            conn.execute(f"SET threads={threads}")
-            conn.execute(f"SET memory_limit='{memory_limit}'")
-            
+        # threads and memory_limit are global to the pooled database, so they are
+        # restored to the pool's configuration once the views are built
+        with DBManager.connection() as conn, \
+                DBManager.scoped_settings(conn, threads=threads, memory_limit=memory_limit):
             # Create indexes to optimize joins if not exist
             logger.info("Creating supporting indexes")
             conn.execute("""
@@ -362,6 +382,12 @@ class RegionRepository(BaseRepository):
                 ON {table_name}(decade_id);
                 """)
                 
+                # Most lookups filter on scenario and decade together
+                conn.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_{table_name}_scenario_time 
+                ON {table_name}(scenario_id, decade_id);
+                """)
+                
                 if 'region' in view_query:
                     conn.execute(f"""
                     CREATE INDEX IF NOT EXISTS idx_{table_name}_region 
@@ -397,11 +423,18 @@ class RegionRepository(BaseRepository):
         
         Args:
             output_dir: Directory where Parquet files will be saved
-            partition_by_scenario: If True, create separate files for each scenario
+            partition_by_scenario: If True, write one hive partition directory per
+                scenario (<view>/scenario_id=<id>/data_<n>.parquet). This replaces
+                the earlier <view>_scenario_<id>_<name>.parquet files: scenario_id
+                is carried only by the directory name, not as a column in the
+                files, so read them with hive_partitioning enabled. Each view
+                directory is cleared first, so it holds only this export
             scenario_ids: Optional list of scenario IDs to export (if None, all scenarios are exported)
             
         Returns:
-            Dictionary mapping view names to their Parquet file paths
+            When partitioned, a dictionary mapping each exported scenario ID to the
+            Parquet files written for it across all views; otherwise a dictionary
+            mapping view names to their Parquet file paths
         """
         logger.info(f"Exporting regional data to Parquet in {output_dir}")
         
@@ -412,9 +445,6 @@ class RegionRepository(BaseRepository):
         exported_files = {}
         
         with DBManager.connection() as conn:
-            # Set optimized settings for export
-            conn.execute("SET threads=8")
-            
             for view_name in cls.MATERIALIZED_VIEWS.keys():
                 mat_table = f"mat_{view_name}"
                 
@@ -425,38 +455,33 @@ class RegionRepository(BaseRepository):
                         scenario_ids_str = ", ".join(str(s_id) for s_id in scenario_ids)
                         scenario_filter = f"WHERE scenario_id IN ({scenario_ids_str})"
                         
-                    # Get all scenarios that match filter
-                    scenarios = conn.execute(f"""
-                    SELECT DISTINCT scenario_id, scenario_name 
-                    FROM {mat_table}
-                    {scenario_filter}
-                    ORDER BY scenario_id
-                    """).fetchall()
-                    
-                    # Create a directory for this view
                     view_dir = os.path.join(output_dir, view_name)
-                    os.makedirs(view_dir, exist_ok=True)
+                    logger.info(f"Exporting {mat_table} partitioned by scenario to {view_dir}")
                     
-                    # Export each scenario to a separate file
-                    for scenario_id, scenario_name in scenarios:
-                        # Clean scenario name for filename
-                        clean_name = "".join(c if c.isalnum() else "_" for c in scenario_name)
-                        filename = f"{view_name}_scenario_{scenario_id}_{clean_name}.parquet"
-                        filepath = os.path.join(view_dir, filename)
-                        
-                        logger.info(f"Exporting {mat_table} for scenario {scenario_id} to {filepath}")
-                        
-                        # Use DuckDB's COPY statement for efficient export
-                        conn.execute(f"""
-                        COPY (
-                            SELECT * FROM {mat_table} 
-                            WHERE scenario_id = {scenario_id}
-                        ) TO '{filepath}' (FORMAT PARQUET, COMPRESSION 'ZSTD')
-                        """)
-                        
-                        if scenario_id not in exported_files:
-                            exported_files[scenario_id] = []
-                        exported_files[scenario_id].append(filepath)
+                    # Start from an empty view directory so partitions from an earlier
+                    # export (other scenarios, or extra files) are neither kept nor reported
+                    shutil.rmtree(view_dir, ignore_errors=True)
+                    
+                    # DuckDB streams the view straight into one hive partition per
+                    # scenario (view_dir/scenario_id=<id>/), so rows never pass through Python
+                    conn.execute(f"""
+                    COPY (
+                        SELECT * FROM {mat_table}
+                        {scenario_filter}
+                    ) 
+                    TO '{view_dir}' (
+                        FORMAT PARQUET, 
+                        PARTITION_BY (scenario_id), 
+                        COMPRESSION 'ZSTD', 
+                        OVERWRITE_OR_IGNORE
+                    )
+                    """)
+                    
+                    # Collect the written files by the scenario encoded in their partition directory
+                    for partition_dir in sorted(Path(view_dir).glob("scenario_id=*")):
+                        scenario_id = int(partition_dir.name.split("=", 1)[1])
+                        files = sorted(str(path) for path in partition_dir.glob("*.parquet"))
+                        exported_files.setdefault(scenario_id, []).extend(files)
                 else:
                     # Export entire view or filtered by scenario_ids to a single file
                     scenario_filter = ""
@@ -480,10 +505,26 @@ class RegionRepository(BaseRepository):
         logger.info(f"Exported {len(exported_files)} regional data files to Parquet format")
         return exported_files
     
+    @classmethod
+    def _in_filter(cls, column: str, value: Union[str, List[str]]) -> tuple:
+        """
+        Build an equality or IN filter for a single value or a list of values.
+        
+        Args:
+            column: Column to filter on
+            value: Single value or list of values
+            
+        Returns:
+            Tuple of (SQL condition, parameter list)
+        """
+        values = [value] if isinstance(value, str) else list(value)
+        placeholders = ','.join(['?'] * len(values))
+        return f" AND {column} IN ({placeholders})", values
+    
     @classmethod
     def get_region_transitions(cls, scenario_id: Optional[int] = None, 
                               decade_id: Optional[int] = None,
-                              region: Optional[str] = None,
+                              region: Optional[Union[str, List[str]]] = None,
                               use_materialized: bool = True) -> pd.DataFrame:
         """
         Get aggregated land use transitions by region.
@@ -491,7 +532,7 @@ class RegionRepository(BaseRepository):
         Args:
             scenario_id: Optional filter by scenario
             decade_id: Optional filter by time step
-            region: Optional filter by region
+            region: Optional filter by region or list of regions
             use_materialized: Whether to use materialized views (much faster)
             
         Returns:
@@ -501,21 +542,17 @@ class RegionRepository(BaseRepository):
         
         query = f"""
         SELECT * FROM {table_name}
-        WHERE 1=1
+        WHERE (? IS NULL OR scenario_id = ?)
+            AND (? IS NULL OR decade_id = ?)
         """
         
-        params = []
-        if scenario_id:
-            query += " AND scenario_id = ?"
-            params.append(scenario_id)
-        
-        if decade_id:
-            query += " AND decade_id = ?"
-            params.append(decade_id)
+        # Optional scenario/decade filters are always bound, so the statement text is constant
+        params = [scenario_id, scenario_id, decade_id, decade_id]
             
         if region:
-            query += " AND region = ?"
-            params.append(region)
+            condition, values = cls._in_filter("region", region)
+            query += condition
+            params.extend(values)
             
         query += " ORDER BY region, from_landuse, to_landuse"
         
@@ -524,8 +561,8 @@ class RegionRepository(BaseRepository):
     @classmethod
     def get_subregion_transitions(cls, scenario_id: Optional[int] = None, 
                                  decade_id: Optional[int] = None,
-                                 region: Optional[str] = None, 
-                                 subregion: Optional[str] = None,
+                                 region: Optional[Union[str, List[str]]] = None, 
+                                 subregion: Optional[Union[str, List[str]]] = None,
                                  use_materialized: bool = True) -> pd.DataFrame:
         """
         Get aggregated land use transitions by subregion.
@@ -533,8 +570,8 @@ class RegionRepository(BaseRepository):
         Args:
             scenario_id: Optional filter by scenario
             decade_id: Optional filter by time step
-            region: Optional filter by region
-            subregion: Optional filter by subregion
+            region: Optional filter by region or list of regions
+            subregion: Optional filter by subregion or list of subregions
             use_materialized: Whether to use materialized views (much faster)
             
         Returns:
@@ -544,25 +581,22 @@ class RegionRepository(BaseRepository):
         
         query = f"""
         SELECT * FROM {table_name}
-        WHERE 1=1
+        WHERE (? IS NULL OR scenario_id = ?)
+            AND (? IS NULL OR decade_id = ?)
         """
         
-        params = []
-        if scenario_id:
-            query += " AND scenario_id = ?"
-            params.append(scenario_id)
-        
-        if decade_id:
-            query += " AND decade_id = ?"
-            params.append(decade_id)
+        # Optional scenario/decade filters are always bound, so the statement text is constant
+        params = [scenario_id, scenario_id, decade_id, decade_id]
             
         if region:
-            query += " AND region = ?"
-            params.append(region)
+            condition, values = cls._in_filter("region", region)
+            query += condition
+            params.extend(values)
             
         if subregion:
-            query += " AND subregion = ?"
-            params.append(subregion)
+            condition, values = cls._in_filter("subregion", subregion)
+            query += condition
+            params.extend(values)
             
         query += " ORDER BY region, subregion, from_landuse, to_landuse"
         
@@ -571,9 +605,9 @@ class RegionRepository(BaseRepository):
     @classmethod
     def get_state_transitions(cls, scenario_id: Optional[int] = None, 
                              decade_id: Optional[int] = None,
-                             state_name: Optional[str] = None,
-                             region: Optional[str] = None, 
-                             subregion: Optional[str] = None,
+                             state_name: Optional[Union[str, List[str]]] = None,
+                             region: Optional[Union[str, List[str]]] = None, 
+                             subregion: Optional[Union[str, List[str]]] = None,
                              use_materialized: bool = True) -> pd.DataFrame:
         """
         Get aggregated land use transitions by state.
@@ -581,9 +615,9 @@ class RegionRepository(BaseRepository):
         Args:
             scenario_id: Optional filter by scenario
             decade_id: Optional filter by time step
-            state_name: Optional filter by state
-            region: Optional filter by region
-            subregion: Optional filter by subregion
+            state_name: Optional filter by state or list of states
+            region: Optional filter by region or list of regions
+            subregion: Optional filter by subregion or list of subregions
             use_materialized: Whether to use materialized views (much faster)
             
         Returns:
@@ -593,29 +627,27 @@ class RegionRepository(BaseRepository):
         
         query = f"""
         SELECT * FROM {table_name}
-        WHERE 1=1
+        WHERE (? IS NULL OR scenario_id = ?)
+            AND (? IS NULL OR decade_id = ?)
         """
         
-        params = []
-        if scenario_id:
-            query += " AND scenario_id = ?"
-            params.append(scenario_id)
-        
-        if decade_id:
-            query += " AND decade_id = ?"
-            params.append(decade_id)
+        # Optional scenario/decade filters are always bound, so the statement text is constant
+        params = [scenario_id, scenario_id, decade_id, decade_id]
             
         if state_name:
-            query += " AND state_name = ?"
-            params.append(state_name)
+            condition, values = cls._in_filter("state_name", state_name)
+            query += condition
+            params.extend(values)
             
         if region:
-            query += " AND region = ?"
-            params.append(region)
+            condition, values = cls._in_filter("region", region)
+            query += condition
+            params.extend(values)
             
         if subregion:
-            query += " AND subregion = ?"
-            params.append(subregion)
+            condition, values = cls._in_filter("subregion", subregion)
+            query += condition
+            params.extend(values)
             
         query += " ORDER BY state_name, from_landuse, to_landuse"
         
@@ -644,17 +676,12 @@ class RegionRepository(BaseRepository):
             SUM(total_area) as total_area
         FROM 
             mat_region_transitions
-        WHERE 1=1
+        WHERE (? IS NULL OR scenario_id = ?)
+            AND (? IS NULL OR decade_id = ?)
         """
         
-        params = []
-        if scenario_id:
-            query += " AND scenario_id = ?"
-            params.append(scenario_id)
-        
-        if decade_id:
-            query += " AND decade_id = ?"
-            params.append(decade_id)
+        # Optional scenario/decade filters are always bound, so the statement text is constant
+        params = [scenario_id, scenario_id, decade_id, decade_id]
             
         query += """
         GROUP BY 
@@ -682,20 +709,19 @@ class RegionRepository(BaseRepository):
         """
         logger.info("Refreshing materialized views for regional analysis")
         
-        with DBManager.connection() as conn:
-            # Set up optimizations
-            conn.execute(f"SET threads={threads}")
-            conn.execute(f"SET memory_limit='{memory_limit}'")
-            
+        # threads and memory_limit are global to the pooled database, so they are
+        # restored to the pool's configuration once the views are built
+        with DBManager.connection() as conn, \
+                DBManager.scoped_settings(conn, threads=threads, memory_limit=memory_limit):
             # For each materialized view
             for view_name, view_query in cls.MATERIALIZED_VIEWS.items():
                 table_name = f"mat_{view_name}"
                 
-                # Check if the table exists
-                table_exists = conn.execute(f"""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name='{table_name}'
-                """).fetchone()
+                # Check if the table exists in DuckDB's native catalog
+                table_exists = conn.execute("""
+                SELECT table_name FROM information_schema.tables 
+                WHERE table_name = ?
+                """, [table_name]).fetchone()
                 
                 if not table_exists:
                     # Table doesn't exist yet, create it
@@ -714,6 +740,11 @@ class RegionRepository(BaseRepository):
                     ON {table_name}(decade_id)
                     """)
                     
+                    conn.execute(f"""
+                    CREATE INDEX IF NOT EXISTS idx_{table_name}_scenario_time 
+                    ON {table_name}(scenario_id, decade_id)
+                    """)
+                    
                     if 'region' in view_query:
                         conn.execute(f"""
                         CREATE INDEX IF NOT EXISTS idx_{table_name}_region 
@@ -764,6 +795,11 @@ class RegionRepository(BaseRepository):
                     ON {table_name}(decade_id)
                     """)
                     
+                    conn.execute(f"""
+                    CREATE INDEX IF NOT EXISTS idx_{table_name}_scenario_time 
+                    ON {table_name}(scenario_id, decade_id)
+                    """)
+                    
                     if 'region' in view_query:
                         conn.execute(f"""
                         CREATE INDEX IF NOT EXISTS idx_{table_name}_region 
@@ -36,7 +36,8 @@ def extract_data_from_duckdb(db_path="data/database/rpa.db", output_dir="semanti
     
     # Connect to DuckDB
     print(f"Connecting to DuckDB database: {db_path}")
-    conn = duckdb.connect(db_path)
+    # Extraction only reads the database, so it can run alongside other readers
+    conn = duckdb.connect(db_path, read_only=True)
     
     # Output file paths
     output_files = {
@@ -102,7 +103,6 @@ def extract_data_from_duckdb(db_path="data/database/rpa.db", output_dir="semanti
             SUM(lc.area_hundreds_acres) as "Total Area"
         FROM landuse_change lc
         JOIN scenarios s ON lc.scenario_id = s.scenario_id
-        JOIN decades d ON lc.decade_id = d.decade_id
         JOIN landuse_types l1 ON lc.from_landuse = l1.landuse_type_code
         JOIN landuse_types l2 ON lc.to_landuse = l2.landuse_type_code
         {scenario_filter}
@@ -130,7 +130,6 @@ def extract_data_from_duckdb(db_path="data/database/rpa.db", output_dir="semanti
         JOIN scenarios s ON lc.scenario_id = s.scenario_id
         JOIN decades d ON lc.decade_id = d.decade_id
         JOIN landuse_types l1 ON lc.from_landuse = l1.landuse_type_code
-        JOIN landuse_types l2 ON lc.to_landuse = l2.landuse_type_code
         {scenario_filter}
         AND lc.to_landuse = 'ur' AND lc.from_landuse != 'ur'
         GROUP BY s.scenario_name, s.gcm, s.rcp, s.ssp, 
@@ -155,7 +154,6 @@ def extract_data_from_duckdb(db_path="data/database/rpa.db", output_dir="semanti
         FROM landuse_change lc
         JOIN scenarios s ON lc.scenario_id = s.scenario_id
         JOIN decades d ON lc.decade_id = d.decade_id
-        JOIN landuse_types l1 ON lc.from_landuse = l1.landuse_type_code
         JOIN landuse_types l2 ON lc.to_landuse = l2.landuse_type_code
         {scenario_filter}
         AND lc.from_landuse = 'fr' AND lc.to_landuse != 'fr'
@@ -230,7 +228,6 @@ def extract_data_from_duckdb(db_path="data/database/rpa.db", output_dir="semanti
         JOIN scenarios s ON lc.scenario_id = s.scenario_id
         JOIN decades d ON lc.decade_id = d.decade_id
         JOIN landuse_types l1 ON lc.from_landuse = l1.landuse_type_code
-        JOIN landuse_types l2 ON lc.to_landuse = l2.landuse_type_code
         {scenario_filter}
         AND lc.to_landuse = 'ur' AND lc.from_landuse != 'ur'
         GROUP BY co.fips_code, co.county_name, co.state_name,
@@ -254,7 +251,6 @@ def extract_data_from_duckdb(db_path="data/database/rpa.db", output_dir="semanti
         JOIN counties co ON lc.fips_code = co.fips_code
         JOIN scenarios s ON lc.scenario_id = s.scenario_id
         JOIN decades d ON lc.decade_id = d.decade_id
-        JOIN landuse_types l1 ON lc.from_landuse = l1.landuse_type_code
         JOIN landuse_types l2 ON lc.to_landuse = l2.landuse_type_code
         {scenario_filter}
         AND lc.from_landuse = 'fr' AND lc.to_landuse != 'fr'
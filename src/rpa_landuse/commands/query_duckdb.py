@@ -6,6 +6,7 @@ This script provides a command-line interface for querying
 the RPA Land Use database using common query patterns.
 """
 
+import os
 import sys
 import argparse
 import duckdb
@@ -15,12 +16,31 @@ from pathlib import Path
 # Default database path
 DB_PATH = "data/database/rpa.db"
 
+# DuckDB vectors (2048 rows each) fetched per chunk when streaming interactive results
+STREAM_VECTORS_PER_CHUNK = 1
 
-def get_connection(db_path=DB_PATH):
-    """Get a DuckDB connection."""
+
+def get_connection(db_path=DB_PATH, read_only=True, preserve_insertion_order=True,
+                   memory_limit=None):
+    """
+    Get a DuckDB connection, read-only unless writes are requested.
+    
+    Args:
+        db_path: Path to the DuckDB database file
+        read_only: Open without taking the write lock
+        preserve_insertion_order: Keep result rows in scan order for queries
+            without an ORDER BY; only safe to disable when every query orders itself
+        memory_limit: Optional DuckDB memory limit (e.g. 4GB); DuckDB's default when unset
+    """
+    # Settings go through the connection config rather than SQL text,
+    # so configured values are never spliced into a statement
+    config = {'preserve_insertion_order': preserve_insertion_order}
+    if memory_limit:
+        config['memory_limit'] = memory_limit
+    
     try:
-        conn = duckdb.connect(db_path)
-        return conn
+        # Read-only connections take no write lock, so several tools can query the file at once
+        return duckdb.connect(db_path, read_only=read_only, config=config)
     except Exception as e:
         print(f"Error connecting to database: {e}")
         sys.exit(1)
@@ -41,14 +61,31 @@ def execute_query(conn, query, params=None):
         return pd.DataFrame()
 
 
+def execute_rows(conn, query, params=None):
+    """Execute a small query and return its rows as a list of tuples."""
+    try:
+        if params:
+            return conn.execute(query, params).fetchall()
+        else:
+            return conn.execute(query).fetchall()
+    except Exception as e:
+        print(f"Error executing query: {e}")
+        print(f"Query: {query}")
+        if params:
+            print(f"Parameters: {params}")
+        return []
+
+
 def list_tables(conn):
-    """List all tables in the database."""
+    """List the names of all tables in the database."""
     query = """
     SELECT table_name 
     FROM information_schema.tables 
     WHERE table_schema = 'main'
+    ORDER BY table_name
     """
-    return execute_query(conn, query)
+    # A single column of names needs no DataFrame
+    return [row[0] for row in execute_rows(conn, query)]
 
 
 def describe_table(conn, table_name):
@@ -93,10 +130,11 @@ def get_time_steps(conn):
 
 def get_land_use_types(conn):
     """Get all land use types."""
+    # The landuse_types lookup table holds one row per code, so there is no
+    # need to scan every transition for distinct values
     query = """
-    SELECT DISTINCT from_landuse as land_use_type FROM landuse_change
-    UNION
-    SELECT DISTINCT to_landuse as land_use_type FROM landuse_change
+    SELECT landuse_type_code as land_use_type
+    FROM landuse_types
     ORDER BY land_use_type
     """
     return execute_query(conn, query)
@@ -112,12 +150,14 @@ def get_counties(conn, state=None):
     FROM 
         counties
     """
+    params = None
     if state:
         query += " WHERE state_name = ?"
-        return execute_query(conn, query, [state])
+        params = [state]
     
+    # Ordered explicitly, since scans no longer preserve insertion order
     query += " ORDER BY state_name, county_name"
-    return execute_query(conn, query)
+    return execute_query(conn, query, params)
 
 
 def get_transitions(conn, scenario_id, time_step_id, fips_code=None, 
@@ -125,7 +165,29 @@ def get_transitions(conn, scenario_id, time_step_id, fips_code=None,
     """
     Get land use transitions with filtering options.
     """
+    # Optional filters are bound as NULL when unused, so the statement text is
+    # the same for every filter combination
     query = """
+    WITH top_transitions AS (
+        -- Filter and rank before the join so only the returned rows are looked up in counties
+        SELECT 
+            fips_code,
+            from_landuse,
+            to_landuse,
+            area_hundreds_acres
+        FROM 
+            landuse_change
+        WHERE 
+            scenario_id = ?
+            AND decade_id = ?
+            AND (? IS NULL OR fips_code = ?)
+            AND (? IS NULL OR from_landuse = ?)
+            AND (? IS NULL OR to_landuse = ?)
+        ORDER BY 
+            -- Rank on the stored column; the * 100 is only computed for returned rows
+            area_hundreds_acres DESC
+        LIMIT ?
+    )
     SELECT 
         c.county_name,
         c.state_name,
@@ -133,34 +195,24 @@ def get_transitions(conn, scenario_id, time_step_id, fips_code=None,
         t.to_landuse,
         t.area_hundreds_acres * 100 as acres_changed
     FROM 
-        landuse_change t
+        top_transitions t
     JOIN
         counties c ON t.fips_code = c.fips_code
-    WHERE 
-        t.scenario_id = ?
-        AND t.decade_id = ?
-    """
-    
-    params = [scenario_id, time_step_id]
-    
-    if fips_code:
-        query += " AND t.fips_code = ?"
-        params.append(fips_code)
-        
-    if from_land_use:
-        query += " AND t.from_landuse = ?"
-        params.append(from_land_use)
-        
-    if to_land_use:
-        query += " AND t.to_landuse = ?"
-        params.append(to_land_use)
-        
-    query += """
     ORDER BY 
-        acres_changed DESC
-    LIMIT ?
+        t.area_hundreds_acres DESC
     """
-    params.append(limit)
+    
+    # Empty strings mean "no filter", as before
+    fips_code = fips_code or None
+    from_land_use = from_land_use or None
+    to_land_use = to_land_use or None
+    params = [
+        scenario_id, time_step_id,
+        fips_code, fips_code,
+        from_land_use, from_land_use,
+        to_land_use, to_land_use,
+        limit
+    ]
     
     return execute_query(conn, query, params)
 
@@ -174,7 +226,7 @@ def interactive_mode(conn):
     """Run in interactive SQL query mode."""
     print("\n--- Interactive DuckDB Query Mode ---")
     print("Enter SQL queries (type 'exit' to quit).")
-    print("Available tables: " + ", ".join(list_tables(conn)['table_name'].tolist()))
+    print("Available tables: " + ", ".join(list_tables(conn)))
     
     while True:
         try:
@@ -185,11 +237,27 @@ def interactive_mode(conn):
             if not query.strip():
                 continue
                 
-            result = execute_query(conn, query)
-            if not result.empty:
-                print("\nResults:")
-                print(result.to_string())
-                print(f"\n[{len(result)} rows returned]")
+            try:
+                result = conn.execute(query)
+            except Exception as e:
+                print(f"Error executing query: {e}")
+                print(f"Query: {query}")
+                continue
+            
+            # Print chunk by chunk so memory stays bounded however large the result is;
+            # chunks are converted like fetchdf(), so column types match execute_query
+            row_count = 0
+            while True:
+                df = result.fetch_df_chunk(STREAM_VECTORS_PER_CHUNK)
+                if df.empty:
+                    break
+                df.index += row_count
+                if row_count == 0:
+                    print("\nResults:")
+                print(df.to_string(header=row_count == 0))
+                row_count += len(df)
+            if row_count:
+                print(f"\n[{row_count} rows returned]")
         except KeyboardInterrupt:
             print("\nExiting...")
             break
@@ -201,6 +269,10 @@ def main():
     """Run the DuckDB query tool."""
     parser = argparse.ArgumentParser(description="RPA Land Use Database Query Tool")
     parser.add_argument('--db', default=DB_PATH, help='Path to DuckDB database file')
+    parser.add_argument('--write', action='store_true',
+                        help='Open the database read-write (needed for modifying SQL)')
+    parser.add_argument('--memory-limit', default=os.getenv('DB_MEMORY_LIMIT'),
+                        help='DuckDB memory limit, e.g. 4GB (default: $DB_MEMORY_LIMIT or DuckDB default)')
     
     subparsers = parser.add_subparsers(dest='command', help='Command to run')
     
@@ -248,11 +320,17 @@ def main():
     
     args = parser.parse_args()
     
-    conn = get_connection(args.db)
+    # The built-in commands all order their results; user-supplied SQL keeps
+    # DuckDB's insertion-order guarantee
+    conn = get_connection(
+        args.db,
+        read_only=not args.write,
+        preserve_insertion_order=args.command in ('sql', 'interactive'),
+        memory_limit=args.memory_limit
+    )
     
     if args.command == 'tables':
-        df = list_tables(conn)
-        print(df.to_string(index=False))
+        print("\n".join(list_tables(conn)))
         
     elif args.command == 'describe':
         df = describe_table(conn, args.table)
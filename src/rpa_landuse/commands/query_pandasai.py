@@ -10,16 +10,24 @@ import sys
 import argparse
 import json
 import pandas as pd
-from rpa_landuse.pandasai.query import (
-    query_transitions,
-    query_to_urban,
-    query_from_forest,
-    query_county_transitions,
-    query_county_to_urban,
-    query_county_from_forest,
-    query_urbanization_trends,
-    multi_dataset_query
-)
+
+def _query_module():
+    """Import the PandasAI query module on first use, so --help never loads PandasAI."""
+    from rpa_landuse.pandasai import query
+    return query
+
+
+# Query function for each --dataset choice, resolved only when a query runs
+DATASET_QUERIES = {
+    "transitions": lambda: _query_module().query_transitions,
+    "to_urban": lambda: _query_module().query_to_urban,
+    "from_forest": lambda: _query_module().query_from_forest,
+    "county": lambda: _query_module().query_county_transitions,
+    "county_to_urban": lambda: _query_module().query_county_to_urban,
+    "county_from_forest": lambda: _query_module().query_county_from_forest,
+    "urbanization": lambda: _query_module().query_urbanization_trends,
+    "all": lambda: _query_module().multi_dataset_query
+}
 
 
 def display_result(result, output_format='pretty'):
@@ -69,16 +77,7 @@ def main():
     
     parser.add_argument(
         "--dataset",
-        choices=[
-            "transitions",
-            "to_urban",
-            "from_forest",
-            "county",
-            "county_to_urban",
-            "county_from_forest",
-            "urbanization",
-            "all"
-        ],
+        choices=list(DATASET_QUERIES),
         default="transitions",
         help="Dataset to query (default: transitions)"
     )
@@ -105,47 +104,12 @@ def main():
     
     try:
         # Determine which dataset to query
-        if args.dataset == "all":
-            result = multi_dataset_query(
-                query=args.query,
-                parquet_dir=args.data_dir
-            )
-        elif args.dataset == "transitions":
-            result = query_transitions(
-                query=args.query,
-                parquet_dir=args.data_dir
-            )
-        elif args.dataset == "to_urban":
-            result = query_to_urban(
-                query=args.query,
-                parquet_dir=args.data_dir
-            )
-        elif args.dataset == "from_forest":
-            result = query_from_forest(
-                query=args.query,
-                parquet_dir=args.data_dir
-            )
-        elif args.dataset == "county":
-            result = query_county_transitions(
-                query=args.query,
-                parquet_dir=args.data_dir
-            )
-        elif args.dataset == "county_to_urban":
-            result = query_county_to_urban(
-                query=args.query,
-                parquet_dir=args.data_dir
-            )
-        elif args.dataset == "county_from_forest":
-            result = query_county_from_forest(
-                query=args.query,
-                parquet_dir=args.data_dir
-            )
-        elif args.dataset == "urbanization":
-            result = query_urbanization_trends(
-                query=args.query,
-                parquet_dir=args.data_dir
-            )
-            
+        query_function = DATASET_QUERIES[args.dataset]()
+        result = query_function(
+            query=args.query,
+            parquet_dir=args.data_dir
+        )
+        
         # Display the result
         display_result(result, args.format)
         
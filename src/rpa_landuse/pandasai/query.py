@@ -3,12 +3,27 @@ Functions for querying the PandasAI semantic layers.
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from pandasai import SmartDataframe
 from pandasai.llm import BambooLLM
 from dotenv import load_dotenv
 
 
+# Parquet file and SmartDataframe name for each dataset
+DATASETS = {
+    "reference": ("reference.parquet", "Reference Information"),
+    "transitions_changes": ("gross_change_ensemble_all.parquet", "Land Use Transitions - Changes Only"),
+    "to_urban": ("to_urban_transitions.parquet", "Transitions TO Urban"),
+    "from_forest": ("from_forest_transitions.parquet", "Transitions FROM Forest"),
+    "county": ("county_transitions.parquet", "County Land Use Transitions"),
+    "county_changes": ("county_transitions_changes_only.parquet", "County Land Use Transitions - Changes Only"),
+    "county_to_urban": ("county_to_urban.parquet", "County Transitions TO Urban"),
+    "county_from_forest": ("county_from_forest.parquet", "County Transitions FROM Forest"),
+    "urbanization": ("urbanization_trends.parquet", "Urbanization Trends")
+}
+
+
 def get_api_key():
     """Get the API key from environment variables."""
     load_dotenv(dotenv_path=".env")
@@ -36,97 +51,40 @@ def get_llm():
     return BambooLLM(api_key=api_key)
 
 
-def load_datasets(parquet_dir="semantic_layers/base_analysis"):
+def load_datasets(parquet_dir="semantic_layers/base_analysis", names=None):
     """
     Load datasets from parquet files and create SmartDataframes.
     
     Args:
         parquet_dir (str): Directory containing parquet files
+        names (list): Dataset names to load, if None loads all
         
     Returns:
         dict: Dictionary with SmartDataframe objects
     """
     llm = get_llm()
     
-    # Paths for the parquet files
-    reference_parquet = f"{parquet_dir}/reference.parquet"
-    transitions_changes_parquet = f"{parquet_dir}/gross_change_ensemble_all.parquet"
-    to_urban_parquet = f"{parquet_dir}/to_urban_transitions.parquet"
-    from_forest_parquet = f"{parquet_dir}/from_forest_transitions.parquet"
-    county_parquet = f"{parquet_dir}/county_transitions.parquet"
-    county_changes_parquet = f"{parquet_dir}/county_transitions_changes_only.parquet"
-    county_to_urban_parquet = f"{parquet_dir}/county_to_urban.parquet"
-    county_from_forest_parquet = f"{parquet_dir}/county_from_forest.parquet"
-    urbanization_parquet = f"{parquet_dir}/urbanization_trends.parquet"
+    if names is None:
+        names = list(DATASETS)
+    # Only read the parquet files that were asked for
+    names = [name for name in names if name in DATASETS]
     
     try:
-        # Load the dataframes
-        reference_df = pd.read_parquet(reference_parquet)
-        transitions_changes_df = pd.read_parquet(transitions_changes_parquet)
-        to_urban_df = pd.read_parquet(to_urban_parquet)
-        from_forest_df = pd.read_parquet(from_forest_parquet)
-        county_df = pd.read_parquet(county_parquet)
-        county_changes_df = pd.read_parquet(county_changes_parquet)
-        county_to_urban_df = pd.read_parquet(county_to_urban_parquet)
-        county_from_forest_df = pd.read_parquet(county_from_forest_parquet)
-        urbanization_df = pd.read_parquet(urbanization_parquet)
-        
-        # Create SmartDataframes
-        reference_smart_df = SmartDataframe(
-            reference_df,
-            config={"llm": llm, "name": "Reference Information"}
-        )
-        
-        transitions_changes_smart_df = SmartDataframe(
-            transitions_changes_df,
-            config={"llm": llm, "name": "Land Use Transitions - Changes Only"}
-        )
-        
-        to_urban_smart_df = SmartDataframe(
-            to_urban_df,
-            config={"llm": llm, "name": "Transitions TO Urban"}
-        )
-        
-        from_forest_smart_df = SmartDataframe(
-            from_forest_df,
-            config={"llm": llm, "name": "Transitions FROM Forest"}
-        )
-        
-        county_smart_df = SmartDataframe(
-            county_df,
-            config={"llm": llm, "name": "County Land Use Transitions"}
-        )
-        
-        county_changes_smart_df = SmartDataframe(
-            county_changes_df,
-            config={"llm": llm, "name": "County Land Use Transitions - Changes Only"}
-        )
-        
-        county_to_urban_smart_df = SmartDataframe(
-            county_to_urban_df,
-            config={"llm": llm, "name": "County Transitions TO Urban"}
-        )
-        
-        county_from_forest_smart_df = SmartDataframe(
-            county_from_forest_df,
-            config={"llm": llm, "name": "County Transitions FROM Forest"}
-        )
-        
-        urbanization_smart_df = SmartDataframe(
-            urbanization_df,
-            config={"llm": llm, "name": "Urbanization Trends"}
-        )
+        # The files are independent and parquet decoding releases the GIL,
+        # so they are read concurrently
+        with ThreadPoolExecutor(max_workers=max(len(names), 1)) as executor:
+            frames = executor.map(
+                lambda name: pd.read_parquet(f"{parquet_dir}/{DATASETS[name][0]}"),
+                names
+            )
+            dfs = dict(zip(names, frames))
         
         return {
-            "reference": reference_smart_df,
-            "transitions_changes": transitions_changes_smart_df,
-            "to_urban": to_urban_smart_df,
-            "from_forest": from_forest_smart_df,
-            "county": county_smart_df,
-            "county_changes": county_changes_smart_df,
-            "county_to_urban": county_to_urban_smart_df,
-            "county_from_forest": county_from_forest_smart_df,
-            "urbanization": urbanization_smart_df
+            name: SmartDataframe(
+                df,
+                config={"llm": llm, "name": DATASETS[name][1]}
+            )
+            for name, df in dfs.items()
         }
     except Exception as e:
         raise RuntimeError(f"Failed to load datasets: {e}")
@@ -325,8 +283,8 @@ def multi_dataset_query(query, datasets=None, parquet_dir="semantic_layers/base_
             "urbanization"
         ]
     
-    # Load all datasets
-    all_datasets = load_datasets(parquet_dir)
+    # Load only the requested datasets
+    all_datasets = load_datasets(parquet_dir, names=datasets)
     
     # Query each dataset
     results = {}
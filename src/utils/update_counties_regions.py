@@ -9,6 +9,7 @@ the state_name, region, and subregion fields in the counties table.
 import logging
 import sys
 import yaml
+import pandas as pd
 from pathlib import Path
 
 # Add the src directory to the Python path
@@ -20,10 +21,10 @@ from src.db.database import DBManager
 # Handle imports for both direct execution and module import
 try:
     # When imported as a module
-    from .state_fips_mapping import STATE_FIPS, STATE_TO_REGION, parse_fips
+    from .state_fips_mapping import STATE_FIPS, STATE_TO_REGION
 except ImportError:
     # When run directly
-    from src.utils.state_fips_mapping import STATE_FIPS, STATE_TO_REGION, parse_fips
+    from src.utils.state_fips_mapping import STATE_FIPS, STATE_TO_REGION
 
 # Set up logging
 logging.basicConfig(
@@ -78,64 +79,44 @@ def update_counties_with_state_info():
     # Load RPA regions from YAML
     rpa_regions = load_rpa_regions()
     
-    # Ensure the counties table has a subregion column
+    # Ensure the counties table has a subregion column; DuckDB skips the
+    # ALTER itself when it already exists, so no probe query is needed
     with DBManager.connection() as conn:
-        # Check if subregion column exists, if not add it
-        check_query = """
-        SELECT * FROM counties LIMIT 1
-        """
-        column_info = conn.execute(check_query).description
-        column_names = [col[0].lower() for col in column_info]
-        
-        if 'subregion' not in column_names:
-            logger.info("Adding subregion column to counties table")
-            conn.execute("ALTER TABLE counties ADD COLUMN subregion TEXT")
+        conn.execute("ALTER TABLE counties ADD COLUMN IF NOT EXISTS subregion TEXT")
+    
+    # Build the per-state lookup once; every county in a state gets the same values
+    states = []
+    for state_fips, state_name in STATE_FIPS.items():
+        if state_name in rpa_regions:
+            region, subregion = rpa_regions[state_name]
+        else:
+            # Fall back to the basic region from STATE_TO_REGION
+            region, subregion = STATE_TO_REGION.get(state_name), None
+        states.append((state_fips, state_name, region, subregion))
+    
+    states_df = pd.DataFrame(
+        states, columns=['state_fips', 'state_name', 'region', 'subregion']
+    )
     
-    # Now get all counties that need updating
-    query = """
-    SELECT 
-        fips_code,
-        state_name
+    # Update all counties in a single set-based statement joined on the state FIPS prefix
+    update_query = """
+    UPDATE counties
+    SET 
+        state_name = s.state_name,
+        state_fips = s.state_fips,
+        region = s.region,
+        subregion = s.subregion
     FROM 
-        counties
+        states_lookup s
+    WHERE 
+        LENGTH(counties.fips_code) = 5
+        AND SUBSTR(counties.fips_code, 1, 2) = s.state_fips
     """
     
     with DBManager.connection() as conn:
-        counties = conn.execute(query).fetchall()
-        
-        # Process each county
-        updated_count = 0
-        for county in counties:
-            fips_code = county[0]
-            existing_state = county[1]
-            
-            state_fips, _ = parse_fips(fips_code)
-            
-            if state_fips and state_fips in STATE_FIPS:
-                state_name = STATE_FIPS[state_fips]
-                
-                # Try to get region and subregion from YAML config
-                region, subregion = None, None
-                if state_name in rpa_regions:
-                    region, subregion = rpa_regions[state_name]
-                else:
-                    # Fall back to the basic region from STATE_TO_REGION
-                    region = STATE_TO_REGION.get(state_name)
-                
-                # Update the county record
-                update_query = """
-                UPDATE counties
-                SET 
-                    state_name = ?,
-                    state_fips = ?,
-                    region = ?,
-                    subregion = ?
-                WHERE 
-                    fips_code = ?
-                """
-                
-                conn.execute(update_query, [state_name, state_fips, region, subregion, fips_code])
-                updated_count += 1
+        conn.register('states_lookup', states_df)
+        updated_count = conn.execute(update_query).fetchone()[0]
+        conn.unregister('states_lookup')
         
         logger.info(f"Updated {updated_count} counties with state, region, and subregion information")
         
@@ -12,7 +12,6 @@ import pandas as pd
 import duckdb
 import logging
 from pathlib import Path
-from tqdm import tqdm
 
 # Add the src directory to the Python path
 src_dir = Path(__file__).resolve().parent.parent
@@ -20,10 +19,10 @@ sys.path.append(str(src_dir.parent))
 
 # Using a relative import when run as a module
 try:
-    from utils.state_fips_mapping import STATE_FIPS, get_region_from_state
+    from utils.state_fips_mapping import STATE_FIPS, STATE_TO_REGION
 except ImportError:
     # For when script is run directly
-    from src.utils.state_fips_mapping import STATE_FIPS, get_region_from_state
+    from src.utils.state_fips_mapping import STATE_FIPS, STATE_TO_REGION
 
 # Configure logging
 logging.basicConfig(
@@ -59,26 +58,16 @@ def fetch_county_data():
         # Create FIPS code by combining state and county codes
         df['fips_code'] = df['state'] + df['county']
         
-        # Extract county name from NAME field (format: "County Name, State Name")
-        df['county_name'] = df['NAME'].apply(lambda x: x.split(',')[0])
+        # Split NAME once (format: "County Name, State Name") into county and state parts
+        name_parts = df['NAME'].str.split(',')
+        df['county_name'] = name_parts.str[0]
+        df['state_name_from_api'] = name_parts.str[1].str.strip()
         
-        # Extract state name from NAME field when available (format: "County Name, State Name")
-        def extract_state_name(name_field):
-            parts = name_field.split(',')
-            if len(parts) > 1:
-                return parts[1].strip()
-            return None
-            
-        df['state_name_from_api'] = df['NAME'].apply(extract_state_name)
+        # Add state_name based on state FIPS code, falling back to the API state name
+        df['state_name'] = df['state'].map(STATE_FIPS).fillna(df['state_name_from_api'])
         
-        # Add state_name based on state FIPS code
-        df['state_name'] = df.apply(
-            lambda row: STATE_FIPS.get(row['state']) or row['state_name_from_api'], 
-            axis=1
-        )
-        
-        # Add region based on state name
-        df['region'] = df['state_name'].apply(lambda x: get_region_from_state(x))
+        # Add region based on state name via the precomputed lookup table
+        df['region'] = df['state_name'].map(STATE_TO_REGION)
         
         # Select only needed columns
         result = df[['fips_code', 'county_name', 'state_name', 'state', 'region']]
@@ -111,7 +100,7 @@ def update_county_names_in_db(db_path=DB_PATH):
         
         # Check if counties table exists
         table_exists = conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='counties'"
+            "SELECT table_name FROM information_schema.tables WHERE table_name = 'counties'"
         ).fetchone()
         
         if not table_exists:
@@ -137,35 +126,33 @@ def update_county_names_in_db(db_path=DB_PATH):
         SELECT * FROM census_counties
         """)
         
-        # Get the list of FIPS codes
-        fips_codes = conn.execute("SELECT DISTINCT fips_code FROM counties").fetchdf()
-        
-        # Apply state names based on FIPS code
+        # Apply state names based on the FIPS state prefix in one set-based update
         logger.info("Updating state names based on FIPS codes")
-        for _, row in tqdm(fips_codes.iterrows(), total=len(fips_codes), desc="Updating state names"):
-            fips = row['fips_code']
-            if fips and len(fips) >= 2:
-                state_fips = fips[:2]
-                state_name = STATE_FIPS.get(state_fips)
-                if state_name:
-                    region = get_region_from_state(state_name)
-                    conn.execute("""
-                    UPDATE counties
-                    SET 
-                        state_name = ?,
-                        state_fips = ?,
-                        region = ?
-                    WHERE fips_code = ?
-                    """, [state_name, state_fips, region, fips])
+        state_lookup = pd.DataFrame({
+            'state_fips': list(STATE_FIPS.keys()),
+            'state_name': list(STATE_FIPS.values())
+        })
+        state_lookup['region'] = state_lookup['state_name'].map(STATE_TO_REGION)
+        conn.register("state_lookup", state_lookup)
+        conn.execute("""
+        UPDATE counties
+        SET 
+            state_name = s.state_name,
+            state_fips = s.state_fips,
+            region = s.region
+        FROM state_lookup s
+        WHERE SUBSTR(counties.fips_code, 1, 2) = s.state_fips
+        """)
         
         # Now update county names with data from Census
         logger.info("Updating county names from Census API data")
-        for _, row in tqdm(county_data.iterrows(), total=len(county_data), desc="Updating counties"):
-            conn.execute("""
-            UPDATE counties 
-            SET county_name = ?
-            WHERE fips_code = ? AND (county_name IS NULL OR county_name LIKE 'County%')
-            """, [row['county_name'], row['fips_code']])
+        conn.execute("""
+        UPDATE counties 
+        SET county_name = t.county_name
+        FROM temp_census_counties t
+        WHERE counties.fips_code = t.fips_code 
+            AND (counties.county_name IS NULL OR counties.county_name LIKE 'County%')
+        """)
         
         # Check for any remaining counties without names
         still_missing = conn.execute("""
@@ -183,9 +170,9 @@ def update_county_names_in_db(db_path=DB_PATH):
         FROM counties 
         WHERE county_name IS NOT NULL AND state_name IS NOT NULL
         LIMIT 5
-        """).fetchdf()
-        for _, row in sample.iterrows():
-            logger.info(f"{row['fips_code']}: {row['county_name']}, {row['state_name']} ({row['region']})")
+        """).fetchall()
+        for fips_code, county_name, state_name, region in sample:
+            logger.info(f"{fips_code}: {county_name}, {state_name} ({region})")
         
         conn.close()
         logger.info("County update completed successfully")
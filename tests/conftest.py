@@ -0,0 +1,111 @@
+"""
+Shared fixtures for the repository query tests.
+
+The fixtures load a small, hand-checkable land use database into an in-memory
+DuckDB instance and install it as the DBManager pool, so repository methods run
+their real SQL without touching data/database/rpa.db.
+"""
+
+import sys
+from pathlib import Path
+
+import duckdb
+import pytest
+
+# Add src directory to path so we can import our modules
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from db.database import DBManager
+from db.land_use_repository import LandUseRepository
+
+SCHEMA_SQL = """
+CREATE TABLE scenarios (
+    scenario_id INTEGER PRIMARY KEY,
+    scenario_name VARCHAR NOT NULL UNIQUE,
+    gcm VARCHAR NOT NULL,
+    rcp VARCHAR NOT NULL,
+    ssp VARCHAR NOT NULL,
+    description VARCHAR
+);
+
+CREATE TABLE decades (
+    decade_id INTEGER PRIMARY KEY,
+    decade_name VARCHAR NOT NULL UNIQUE,
+    start_year INTEGER NOT NULL,
+    end_year INTEGER NOT NULL
+);
+
+CREATE TABLE counties (
+    fips_code VARCHAR PRIMARY KEY,
+    county_name VARCHAR,
+    state_name VARCHAR,
+    state_fips VARCHAR,
+    region VARCHAR,
+    subregion VARCHAR
+);
+
+CREATE TABLE landuse_change (
+    transition_id INTEGER PRIMARY KEY,
+    scenario_id INTEGER NOT NULL,
+    decade_id INTEGER NOT NULL,
+    fips_code VARCHAR NOT NULL,
+    from_landuse VARCHAR NOT NULL,
+    to_landuse VARCHAR NOT NULL,
+    area_hundreds_acres DOUBLE NOT NULL
+);
+"""
+
+SCENARIOS = [
+    (1, 'CNRM_CM5_rcp45_ssp1', 'CNRM_CM5', 'rcp45', 'ssp1', 'Test scenario 1'),
+    (2, 'HadGEM2_ES365_rcp85_ssp5', 'HadGEM2_ES365', 'rcp85', 'ssp5', 'Test scenario 2'),
+]
+
+DECADES = [
+    (1, '2012-2020', 2012, 2020),
+    (2, '2020-2030', 2020, 2030),
+    (3, '2030-2040', 2030, 2040),
+]
+
+COUNTIES = [
+    ('01001', 'Autauga', 'Alabama', '01', 'South', 'Southeast'),
+    ('06001', 'Alameda', 'California', '06', 'Pacific Coast', 'Pacific Southwest'),
+]
+
+# (transition_id, scenario_id, decade_id, fips_code, from, to, area_hundreds_acres)
+TRANSITIONS = [
+    (1, 1, 1, '01001', 'cr', 'ur', 2.0),
+    (2, 1, 1, '01001', 'fr', 'ur', 1.0),
+    (3, 1, 1, '06001', 'cr', 'fr', 3.0),
+    (4, 1, 2, '01001', 'cr', 'ur', 4.0),
+    (5, 1, 2, '06001', 'fr', 'cr', 1.0),
+    (6, 1, 3, '01001', 'fr', 'ur', 2.0),
+    (7, 2, 1, '01001', 'cr', 'ur', 6.0),
+    (8, 2, 1, '01001', 'fr', 'ur', 1.0),
+    (9, 2, 2, '01001', 'cr', 'ur', 2.0),
+    (10, 2, 2, '06001', 'rg', 'ur', 3.0),
+]
+
+@pytest.fixture
+def landuse_db():
+    """
+    Install a seeded in-memory database as the DBManager pool.
+    
+    Yields the root connection so tests can inspect or extend the data; the
+    pool is closed afterwards so the next test starts from a fresh database.
+    Cached dimension tables are dropped too, since an in-memory database has no
+    file signature to invalidate them.
+    """
+    DBManager.close_pool()
+    LandUseRepository.clear_cache()
+    
+    # Same settings as the real pool, so setting changes can be checked against it
+    conn = duckdb.connect(':memory:', config=DBManager._pool_config())
+    conn.execute(SCHEMA_SQL)
+    conn.executemany("INSERT INTO scenarios VALUES (?, ?, ?, ?, ?, ?)", SCENARIOS)
+    conn.executemany("INSERT INTO decades VALUES (?, ?, ?, ?)", DECADES)
+    conn.executemany("INSERT INTO counties VALUES (?, ?, ?, ?, ?, ?)", COUNTIES)
+    conn.executemany("INSERT INTO landuse_change VALUES (?, ?, ?, ?, ?, ?, ?)", TRANSITIONS)
+    
+    DBManager._pool = conn
+    yield conn
+    DBManager.close_pool()
+    LandUseRepository.clear_cache()
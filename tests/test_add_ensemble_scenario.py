@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the ensemble scenario builder against the in-memory fixture database.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path so we can import our modules
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from db.add_ensemble_scenario import (
+    calculate_and_insert_ensemble_transitions,
+    check_if_ensemble_exists,
+    create_ensemble_scenario,
+    get_next_scenario_id,
+    get_source_scenario_ids
+)
+
+class TestSourceScenarios:
+    """Test selection of the scenarios an ensemble averages."""
+    
+    def test_rcp_and_ssp_filters(self, landuse_db):
+        """Optional RCP and SSP filters narrow the source scenarios."""
+        assert get_source_scenario_ids() == [1, 2]
+        assert get_source_scenario_ids(rcp='rcp85') == [2]
+        assert get_source_scenario_ids(rcp='rcp45', ssp='ssp5') == []
+    
+    def test_ensembles_are_not_sources(self, landuse_db):
+        """Existing ensemble scenarios are never averaged again."""
+        ensemble_id = create_ensemble_scenario('ensemble_overall', 'ensemble', 'all', 'all', 'Mean')
+        
+        assert ensemble_id == 3
+        assert get_next_scenario_id() == 4
+        assert check_if_ensemble_exists('ensemble_overall') == 3
+        assert get_source_scenario_ids() == [1, 2]
+
+class TestEnsembleTransitions:
+    """Test the single-statement ensemble insert."""
+    
+    def test_averages_and_ids(self, landuse_db):
+        """One row per transition key holds the mean over the scenarios that report it."""
+        inserted = calculate_and_insert_ensemble_transitions(3, [1, 2])
+        
+        rows = landuse_db.execute("""
+            SELECT transition_id, decade_id, fips_code, from_landuse, to_landuse, area_hundreds_acres
+            FROM landuse_change
+            WHERE scenario_id = 3
+            ORDER BY transition_id
+        """).fetchall()
+        
+        assert inserted == 7
+        assert [row[0] for row in rows] == list(range(11, 18))
+        assert [row[1:] for row in rows] == [
+            (1, '01001', 'cr', 'ur', 4.0),
+            (1, '01001', 'fr', 'ur', 1.0),
+            (1, '06001', 'cr', 'fr', 3.0),
+            (2, '01001', 'cr', 'ur', 3.0),
+            (2, '06001', 'fr', 'cr', 1.0),
+            (2, '06001', 'rg', 'ur', 3.0),
+            (3, '01001', 'fr', 'ur', 2.0),
+        ]
+    
+    def test_no_sources(self, landuse_db):
+        """An empty source list inserts nothing."""
+        assert calculate_and_insert_ensemble_transitions(3, []) == 0
+        assert landuse_db.execute("SELECT COUNT(*) FROM landuse_change WHERE scenario_id = 3").fetchone()[0] == 0
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for the AnalysisRepository queries against the in-memory fixture database.
+
+Areas in the fixture are in hundreds of acres, so every expected acreage below
+is 100 times the seeded values.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src directory to path so we can import our modules
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from db.analysis_repository import AnalysisRepository
+
+SCENARIO_1 = 'CNRM_CM5_rcp45_ssp1'
+SCENARIO_2 = 'HadGEM2_ES365_rcp85_ssp5'
+
+def as_dict(df, key, value):
+    """Map one column of a result frame onto another."""
+    return dict(zip(df[key], df[value]))
+
+class TestNetChange:
+    """Test net change and annualized rate aggregation."""
+    
+    def test_net_change_all_years(self, landuse_db):
+        """Each transition counts as a loss for its source and a gain for its destination."""
+        df = AnalysisRepository.total_net_change_by_land_use_type(scenario_id=1)
+        
+        assert as_dict(df, 'land_use_type', 'total_net_change') == {
+            'ur': 900.0,
+            'fr': -100.0,
+            'cr': -800.0,
+        }
+        assert df['total_net_change'].sum() == 0
+    
+    def test_net_change_year_range(self, landuse_db):
+        """A year range keeps only decades inside it."""
+        df = AnalysisRepository.total_net_change_by_land_use_type(
+            start_year=2012, end_year=2020, scenario_id=1
+        )
+        
+        assert as_dict(df, 'land_use_type', 'total_net_change') == {
+            'ur': 300.0,
+            'fr': 200.0,
+            'cr': -500.0,
+        }
+    
+    def test_annualized_change_rate(self, landuse_db):
+        """Net change is divided by the decade length."""
+        df = AnalysisRepository.annualized_change_rate(scenario_id=1)
+        
+        first_decade = df[df['start_year'] == 2012]
+        rates = as_dict(first_decade, 'land_use_type', 'annual_change_rate')
+        assert rates['ur'] == pytest.approx(300.0 / 8)
+        assert rates['cr'] == pytest.approx(-500.0 / 8)
+        assert set(first_decade['period_years']) == {8}
+
+class TestPeakChange:
+    """Test peak change period selection."""
+    
+    def test_peak_respects_scenario(self, landuse_db):
+        """The peak is found within the requested scenario only."""
+        df = AnalysisRepository.peak_change_time_period(scenario_id=1, land_use_type='ur')
+        
+        assert len(df) == 1
+        row = df.iloc[0]
+        assert (row['start_year'], row['end_year']) == (2020, 2030)
+        assert row['total_net_change'] == 400.0
+    
+    def test_peak_across_scenarios(self, landuse_db):
+        """Without a scenario filter the decade totals of all scenarios are ranked."""
+        df = AnalysisRepository.peak_change_time_period(land_use_type='ur')
+        
+        row = df.iloc[0]
+        assert (row['start_year'], row['end_year']) == (2012, 2020)
+        assert row['total_net_change'] == 1000.0
+    
+    def test_one_row_per_land_use(self, landuse_db):
+        """Without a land use filter every land use gets its own peak."""
+        df = AnalysisRepository.peak_change_time_period(scenario_id=1)
+        
+        assert sorted(df['land_use_type']) == ['cr', 'fr', 'ur']
+
+class TestMajorTransitions:
+    """Test major transition ranking and decade matching."""
+    
+    def test_overlapping_decade(self, landuse_db):
+        """Only decades overlapping the range are summed, largest first."""
+        df = AnalysisRepository.major_transitions(2020, 2030)
+        
+        rows = list(df.itertuples(index=False, name=None))
+        assert rows == [
+            ('cr', 'ur', 600.0),
+            ('rg', 'ur', 300.0),
+            ('fr', 'cr', 100.0),
+        ]
+    
+    def test_scenario_and_limit(self, landuse_db):
+        """The scenario filter and limit are applied."""
+        df = AnalysisRepository.major_transitions(2020, 2030, scenario_id=2, limit=1)
+        
+        rows = list(df.itertuples(index=False, name=None))
+        assert rows == [('rg', 'ur', 300.0)]
+    
+    def test_closest_decade_fallback(self, landuse_db):
+        """A range overlapping no decade falls back to the closest one."""
+        df = AnalysisRepository.major_transitions(2050, 2060)
+        
+        rows = list(df.itertuples(index=False, name=None))
+        assert rows == [('fr', 'ur', 200.0)]
+
+class TestCompareScenarios:
+    """Test side-by-side scenario comparison."""
+    
+    def test_gains_by_scenario_name(self, landuse_db):
+        """Changes are attributed to the scenario named in each position."""
+        df = AnalysisRepository.compare_scenarios(2012, 2020, 'ur', SCENARIO_1, SCENARIO_2)
+        
+        assert df['direction'].tolist() == ['to', 'to']
+        cr = df[df['conversion'] == 'cr'].iloc[0]
+        assert cr['scenario1_change'] == 200.0
+        assert cr['scenario2_change'] == 600.0
+        assert cr['difference'] == -400.0
+        assert cr['percent_difference'] == pytest.approx(-400.0 / 600.0 * 100)
+        # Largest absolute difference first
+        assert df.iloc[0]['conversion'] == 'cr'
+    
+    def test_swapped_scenarios(self, landuse_db):
+        """Swapping the names swaps the columns."""
+        df = AnalysisRepository.compare_scenarios(2012, 2020, 'ur', SCENARIO_2, SCENARIO_1)
+        
+        cr = df[df['conversion'] == 'cr'].iloc[0]
+        assert cr['scenario1_change'] == 600.0
+        assert cr['scenario2_change'] == 200.0
+    
+    def test_losses_present_in_both_scenarios_only(self, landuse_db):
+        """Losses are negative and transitions missing from either scenario are left out."""
+        df = AnalysisRepository.compare_scenarios(2012, 2020, 'cr', SCENARIO_1, SCENARIO_2)
+        
+        rows = list(df[['direction', 'conversion', 'scenario1_change', 'scenario2_change']].itertuples(index=False, name=None))
+        assert rows == [('from', 'ur', -200.0, -600.0)]
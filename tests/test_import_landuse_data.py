@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the transition-matrix flattening in the JSON importer.
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add src directory to path so we can import our modules
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from db.import_landuse_data import build_transition_rows
+
+# One time step of county matrices: each row is a source land use with an area
+# per destination, plus a totals row without '_row' and an extra 't1' column
+TIME_STEP_DATA = {
+    '01001': [
+        {'_row': 'cr', 'cr': 10.0, 'ps': 0.0, 'rg': 0.0, 'fr': 1.5, 'ur': 2.0, 't1': 13.5},
+        {'_row': 'fr', 'fr': 5.0, 'ur': 0.5},
+        {'cr': 10.0, 'fr': 6.5, 'ur': 2.5},
+    ],
+    '06001': [
+        {'_row': 'ps', 'cr': 1.0, 'ps': 0.0},
+    ],
+}
+
+class TestBuildTransitionRows:
+    """Test flattening of county transition matrices into table rows."""
+    
+    def test_rows_follow_county_source_destination_order(self):
+        """Rows come out county by county, source by source, in destination code order."""
+        df = build_transition_rows(TIME_STEP_DATA, scenario_id=3, time_step_id=2, first_transition_id=7)
+        
+        rows = list(df[['fips_code', 'from_land_use', 'to_land_use', 'area_hundreds_acres']].itertuples(index=False, name=None))
+        assert rows == [
+            ('01001', 'cr', 'cr', 10.0),
+            ('01001', 'cr', 'fr', 1.5),
+            ('01001', 'cr', 'ur', 2.0),
+            ('01001', 'fr', 'fr', 5.0),
+            ('01001', 'fr', 'ur', 0.5),
+            ('06001', 'ps', 'cr', 1.0),
+        ]
+    
+    def test_ids_and_keys(self):
+        """Transition IDs are consecutive from the given start and keys are broadcast."""
+        df = build_transition_rows(TIME_STEP_DATA, scenario_id=3, time_step_id=2, first_transition_id=7)
+        
+        assert list(df.columns) == [
+            'transition_id', 'scenario_id', 'time_step_id', 'fips_code',
+            'from_land_use', 'to_land_use', 'area_hundreds_acres'
+        ]
+        assert df['transition_id'].tolist() == list(range(7, 13))
+        assert (df['scenario_id'] == 3).all()
+        assert (df['time_step_id'] == 2).all()
+    
+    def test_zero_areas_and_totals_rows_are_dropped(self):
+        """Zero and missing areas, totals rows and non-land-use columns produce no rows."""
+        df = build_transition_rows(TIME_STEP_DATA, scenario_id=1, time_step_id=1, first_transition_id=1)
+        
+        assert (df['area_hundreds_acres'] > 0).all()
+        assert not df['to_land_use'].isin(['t1']).any()
+        assert set(df['from_land_use']) == {'cr', 'fr', 'ps'}
+    
+    def test_empty_time_step(self):
+        """A time step without matrix rows yields an empty frame with the table columns."""
+        df = build_transition_rows({'01001': [{'cr': 1.0}]}, scenario_id=1, time_step_id=1, first_transition_id=1)
+        
+        assert df.empty
+        assert 'area_hundreds_acres' in df.columns
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for LandUseRepository transition lookups and dimension caching.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path so we can import our modules
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from db.database import DB_CONFIG, DBManager
+from db.land_use_repository import LandUseRepository
+from db.region_repository import RegionRepository
+
+class TestGetTransitions:
+    """Test the national and county transition lookups."""
+    
+    def test_base_table_by_default(self, landuse_db):
+        """Scenarios added after the last view refresh are visible by default."""
+        RegionRepository.create_materialized_views(threads=1, memory_limit='1GB')
+        landuse_db.execute("INSERT INTO scenarios VALUES (3, 'late', 'gcm', 'rcp45', 'ssp2', NULL)")
+        landuse_db.execute("INSERT INTO landuse_change VALUES (11, 3, 1, '01001', 'ps', 'ur', 1.5)")
+        
+        df = LandUseRepository.get_transitions(3, [1])
+        assert list(df.itertuples(index=False, name=None)) == [('ps', 'ur', 150.0)]
+        
+        # The materialized snapshot predates the new scenario
+        assert LandUseRepository.get_transitions(3, [1], use_materialized=True).empty
+    
+    def test_materialized_totals_match(self, landuse_db):
+        """Opting into the materialized table returns the same national totals."""
+        RegionRepository.create_materialized_views(threads=1, memory_limit='1GB')
+        
+        base = LandUseRepository.get_transitions(1, [1, 2])
+        materialized = LandUseRepository.get_transitions(1, [1, 2], use_materialized=True)
+        assert list(base.itertuples(index=False, name=None)) == list(materialized.itertuples(index=False, name=None))
+    
+    def test_county_and_land_use_filters(self, landuse_db):
+        """County and source land use filters are applied to the base table."""
+        df = LandUseRepository.get_transitions(1, [1, 2], fips_code='01001', land_use_type='cr')
+        
+        assert list(df.itertuples(index=False, name=None)) == [('cr', 'ur', 600.0)]
+
+class TestDimensionCache:
+    """Test invalidation of the cached dimension tables."""
+    
+    def test_cache_follows_database_writes(self, tmp_path, monkeypatch):
+        """A committed write changes the database signature and refreshes the cache."""
+        monkeypatch.setitem(DB_CONFIG, 'database_path', str(tmp_path / 'rpa.db'))
+        DBManager.close_pool()
+        LandUseRepository.clear_cache()
+        
+        try:
+            with DBManager.connection() as conn:
+                conn.execute("""
+                    CREATE TABLE scenarios (
+                        scenario_id INTEGER, scenario_name VARCHAR, gcm VARCHAR,
+                        rcp VARCHAR, ssp VARCHAR, description VARCHAR
+                    )
+                """)
+                conn.execute("INSERT INTO scenarios VALUES (1, 'a', 'gcm', 'rcp45', 'ssp1', NULL)")
+            
+            assert len(LandUseRepository.get_scenarios()) == 1
+            
+            with DBManager.connection() as conn:
+                conn.execute("INSERT INTO scenarios VALUES (2, 'b', 'gcm', 'rcp85', 'ssp5', NULL)")
+            
+            assert len(LandUseRepository.get_scenarios()) == 2
+        finally:
+            DBManager.close_pool()
+            LandUseRepository.clear_cache()
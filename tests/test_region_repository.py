@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for the RegionRepository regional queries against the in-memory fixture database.
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add src directory to path so we can import our modules
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from db.region_repository import RegionRepository
+
+def transition_rows(df):
+    """Return (region, from, to, total_area) tuples from a region transitions frame."""
+    return list(df[['region', 'from_landuse', 'to_landuse', 'total_area']].itertuples(index=False, name=None))
+
+class TestRegionTransitions:
+    """Test the optional scenario, decade and region filters."""
+    
+    def test_scenario_and_decade_filters(self, landuse_db):
+        """Bound scenario and decade filters select one slice."""
+        df = RegionRepository.get_region_transitions(scenario_id=1, decade_id=1, use_materialized=False)
+        
+        assert transition_rows(df) == [
+            ('Pacific Coast', 'cr', 'fr', 3.0),
+            ('South', 'cr', 'ur', 2.0),
+            ('South', 'fr', 'ur', 1.0),
+        ]
+    
+    def test_unset_filters_match_everything(self, landuse_db):
+        """None filters leave every scenario and decade in the result."""
+        df = RegionRepository.get_region_transitions(use_materialized=False)
+        
+        assert set(df['scenario_id']) == {1, 2}
+        assert set(df['decade_id']) == {1, 2, 3}
+        assert df['total_area'].sum() == 25.0
+    
+    def test_region_list_filter(self, landuse_db):
+        """A list of regions is matched with IN."""
+        df = RegionRepository.get_region_transitions(
+            scenario_id=2, region=['South'], use_materialized=False
+        )
+        
+        assert set(df['region']) == {'South'}
+        assert df['total_area'].sum() == 9.0
+    
+    def test_materialized_views_match_base_tables(self, landuse_db):
+        """The materialized tables return the same rows as the live queries."""
+        RegionRepository.create_materialized_views(threads=1, memory_limit='1GB')
+        
+        materialized = RegionRepository.get_region_transitions(scenario_id=2, decade_id=2)
+        live = RegionRepository.get_region_transitions(scenario_id=2, decade_id=2, use_materialized=False)
+        pd.testing.assert_frame_equal(materialized, live)
+        
+        totals = RegionRepository.get_region_totals(scenario_id=1, decade_id=2)
+        assert dict(zip(totals['region'], totals['total_area'])) == {
+            'Pacific Coast': 1.0,
+            'South': 4.0,
+        }
+
+class TestMaterializedViewSettings:
+    """Test that view builds leave the pooled database settings alone."""
+    
+    def test_settings_restored(self, landuse_db):
+        """Per-build threads and memory limit do not outlive the build."""
+        settings_query = "SELECT current_setting('threads'), current_setting('memory_limit')"
+        before = landuse_db.execute(settings_query).fetchone()
+        
+        RegionRepository.create_materialized_views(threads=1, memory_limit='1GB')
+        assert landuse_db.execute(settings_query).fetchone() == before
+        
+        RegionRepository.refresh_materialized_views(threads=1, memory_limit='1GB')
+        assert landuse_db.execute(settings_query).fetchone() == before
+
+class TestParquetExport:
+    """Test the Parquet export of the materialized views."""
+    
+    def test_partitioned_export(self, landuse_db, tmp_path):
+        """Each scenario is written to its own hive partition directory."""
+        RegionRepository.create_materialized_views(threads=1, memory_limit='1GB')
+        
+        exported = RegionRepository.export_regional_data_to_parquet(
+            output_dir=str(tmp_path), scenario_ids=[2]
+        )
+        
+        assert list(exported) == [2]
+        assert len(exported[2]) == len(RegionRepository.MATERIALIZED_VIEWS)
+        region_dir = tmp_path / 'region_transitions'
+        assert [path.name for path in region_dir.iterdir()] == ['scenario_id=2']
+        
+        df = pd.read_parquet(exported[2][0])
+        assert 'scenario_id' not in df.columns
+        assert df['total_area'].sum() == 12.0
+    
+    def test_reexport_replaces_earlier_partitions(self, landuse_db, tmp_path):
+        """A narrower re-export neither reports nor keeps partitions from the earlier one."""
+        RegionRepository.create_materialized_views(threads=1, memory_limit='1GB')
+        
+        first = RegionRepository.export_regional_data_to_parquet(output_dir=str(tmp_path))
+        assert sorted(first) == [1, 2]
+        
+        second = RegionRepository.export_regional_data_to_parquet(
+            output_dir=str(tmp_path), scenario_ids=[2]
+        )
+        assert list(second) == [2]
+        for view_name in RegionRepository.MATERIALIZED_VIEWS:
+            assert [path.name for path in (tmp_path / view_name).iterdir()] == ['scenario_id=2']
+    
+    def test_single_file_export(self, landuse_db, tmp_path):
+        """Without partitioning each view is written to one file."""
+        RegionRepository.create_materialized_views(threads=1, memory_limit='1GB')
+        
+        exported = RegionRepository.export_regional_data_to_parquet(
+            output_dir=str(tmp_path), partition_by_scenario=False
+        )
+        
+        assert set(exported) == set(RegionRepository.MATERIALIZED_VIEWS)
+        df = pd.read_parquet(exported['national_transitions'])
+        assert set(df['scenario_id']) == {1, 2}